@@ -31,16 +31,139 @@ Mejora:
 
   Esta implementación:
     - Infere automáticamente los slots a consultar leyendo el primer segmento del AID (antes del primer '-').
-    - Ejecuta ddmi status por cada slot encontrado y crea un mapa {"ont-<aid>": "<rx>"}.
+    - Ejecuta ddmi status por cada slot encontrado y crea un mapa {"<aid>": "<rx>"}.
     - Añade "ONT Rx" a cada registro (si hay match).
+
+Transporte:
+- Usa RawTelnet (socket + recv en bloque, IAC procesado por tramos) en lugar de telnetlib,
+  que procesa byte a byte y penaliza salidas grandes como "ddmi status".
+- "filter X" se parsea en streaming (_send_command_stream + _FilterRowParser): las líneas se
+  consumen según llegan y no se guarda la salida completa en memoria.
 """
 
-import telnetlib
 import re
-import json
 import time
+import select
 import sys
-from typing import List, Dict, Any, Optional, Tuple, Set
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Set, Iterable, Iterator, BinaryIO
+
+from ._rawtelnet import RawTelnet
+from ._jsonutil import to_json as _to_json
+
+# Backend regex opcional para el patrón caliente (DDMI): google-re2 (DFA, tiempo lineal)
+# si está instalado; si no, "re" estándar. No añade dependencia obligatoria.
+try:
+    import re2 as _re_hot
+except ImportError:
+    _re_hot = re
+
+# whitespace ASCII (mismo conjunto que bytes.strip() y \s en patrones bytes)
+_WS_BYTES = b" \t\n\r\x0b\x0c"
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_prompt_end_re(prompt_bytes: bytes) -> "re.Pattern[bytes]":
+    """
+    Regex "prompt al final" compilada una vez por prompt (compartida entre instancias).
+    """
+    return re.compile(re.escape(prompt_bytes) + rb"\s*$")
+
+
+class _OntRec:
+    """
+    Registro interno por AID de _parse_all_onts_filter (filas Config/Actual).
+    Guarda las filas que hay que aplicar (Config hasta ver la primera Actual, luego Actual)
+    y se materializa a dict una sola vez, al final del parseo.
+    """
+
+    __slots__ = ("aid", "has_actual", "rows")
+
+    def __init__(self, aid: str):
+        self.aid = aid
+        self.has_actual = False
+        self.rows: List[Dict[str, Any]] = []
+
+
+class _FilterRowParser:
+    """
+    Parser incremental de "show interface remote ont filter <n>" (APIOLT1240XA).
+    feed() recibe bloques de líneas completas y conserva el estado entre bloques
+    (cabecera, último AID, registros por AID); result() materializa y ordena.
+    """
+
+    __slots__ = ("api", "by_aid", "last_aid", "header_mode")
+
+    def __init__(self, api: "APIOLT1240XA"):
+        self.api = api
+        self.by_aid: Dict[str, _OntRec] = {}
+        self.last_aid: Optional[str] = None
+        self.header_mode = False
+
+    def feed(self, text: str) -> None:
+        api = self.api
+        by_aid = self.by_aid
+        last_aid = self.last_aid
+        header_mode = self.header_mode
+
+        for m in api._FILTER_LINE_RE.finditer(text):
+            kind = m.lastgroup
+
+            if kind == "hdr":
+                header_mode = True
+                last_aid = None
+                continue
+
+            # fuera de tabla solo interesa la cabecera
+            if not header_mode:
+                continue
+
+            if kind == "slot":
+                header_mode = False
+                last_aid = None
+                continue
+
+            parsed = api._parse_remote_ont_filter_row(
+                m.group("aid").strip(),
+                m.group("mid").strip(),
+                (m.group("img") or "").strip(),
+                (m.group("vm") or "").strip(),
+                last_aid=last_aid,
+            )
+            if not parsed:
+                continue
+
+            aid = parsed["AID"]
+            last_aid = aid
+
+            row_type = parsed["_row_type"]
+            row_payload = parsed["_row_payload"]
+
+            rec = by_aid.get(aid)
+            if rec is None:
+                rec = by_aid[aid] = _OntRec(aid)
+
+            # se prioriza Actual: una Config posterior a una Actual no aporta nada
+            if row_type == "Actual":
+                rec.has_actual = True
+                rec.rows.append(row_payload)
+            elif not rec.has_actual:
+                rec.rows.append(row_payload)
+
+        self.last_aid = last_aid
+        self.header_mode = header_mode
+
+    def result(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for rec in self.by_aid.values():
+            d: Dict[str, Any] = {"AID": rec.aid}
+            for row_payload in rec.rows:
+                self.api._apply_chosen_row_to_record(d, row_payload)
+            out.append(d)
+
+        out.sort(key=lambda x: x.get("AID", ""))
+        return out
 
 
 class APIOLT1240XA:
@@ -55,21 +178,63 @@ class APIOLT1240XA:
     # Pon AID típico: pon-5-15
     PON_AID_RE = re.compile(r"^pon-\d+(?:-\d+){1,}$")
 
-    # Separadores tipo: "-----+-----"
-    SEP_RE = re.compile(r"^\s*-+\s*\+\s*-+.*$")
-
     # ANSI / VT100
     ANSI_RE = re.compile(rb"\x1b\[[0-9;?]*[A-Za-z]")
 
+    # _drain_input: segundos sin datos tras los que se da la entrada por vacía
+    DRAIN_QUIET = 0.05
+
+    # Clasificador de líneas de "filter <n>" en una sola pasada finditer (MULTILINE):
+    #   hdr  -> cabecera "AID ... Vendor/Model"
+    #   slot -> fin de bloque "slot N has M ont" (sin "|")
+    #   row  -> fila de datos "AID | mid | imgver | vendor/model" (columnas extra se ignoran)
+    # Separadores y vacías no casan con ninguna rama y se saltan dentro del motor regex.
+    _FILTER_LINE_RE = re.compile(
+        r"^[ \t]*(?:"
+        r"(?P<hdr>(?=[^\n]*AID)(?=[^\n]*Vendor/Model)[^\n]*)"
+        r"|(?P<slot>slot(?=[^|\n]* has )(?=[^|\n]* ont) [^|\n]*)$"
+        r"|(?P<row>(?P<aid>[^|\n]*)\|(?P<mid>[^|\n]*)(?:\|(?P<img>[^|\n]*))?(?:\|(?P<vm>[^|\n]*))?)"
+        r")",
+        re.MULTILINE,
+    )
+
+    # Línea UnReg completa: "pon-x-y | <resto>" (el resto se valida con _UNREG_ROW_RE)
+    _UNREG_LINE_RE = re.compile(r"^[ \t]*(?P<pon>pon-[^|\n]*?)[ \t]*\|(?P<right>[^\n]*)$", re.MULTILINE)
+
     # UnReg row:
     #   UnReg 5A5955501648EB50 DEFAULT Active
     _UNREG_ROW_RE = re.compile(
-        r"^(?P<type>\S+)\s+(?P<sn>[0-9A-Fa-f]{8,32})\s+(?P<password>\S+)\s+(?P<status>\S+)\s*$"
+        r"^\s*(?P<type>\S+)\s+(?P<sn>[0-9A-Fa-f]{8,32})\s+(?P<password>\S+)\s+(?P<status>\S+)\s*$"
+    )
+
+    # Versión de firmware en la columna "Image Active Version": V540ABNA2E0a06
+    _FW_VERSION_RE = re.compile(r"V[0-9A-Za-z._-]{3,}")
+
+    # Campos de la fila elegida -> registro final (origen, destino), en orden de aplicación
+    _CHOSEN_MAPPINGS = (
+        ("SN", "SN"),
+        ("Password", "Password"),
+        ("Status", "Status"),
+        ("Model", "Model"),
+        ("Vendor", "Vendor"),
+        ("Version", "FW Version"),
+        ("Type", "Type"),
+        ("Image", "Image"),
+        ("Active", "Active"),
     )
 
-    # DDMI helpers: capturar ont-id al inicio y el último float al final (tolerante a "++", "-", etc.)
-    _DDMI_ONT_ID_RE = re.compile(r"^\s*(?P<ont>ont-\d+(?:-\d+){2,})\b", re.IGNORECASE)
-    _DDMI_LAST_FLOAT_RE = re.compile(r"(?P<rx>[+-]?\d+(?:\.\d+)?)\s*$")
+    # Comprobaciones de token sin regex (más baratas en bucles por fila)
+    _HEXSET = frozenset("0123456789abcdefABCDEF")
+    _VENDOR_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+    # DDMI: una sola pasada multilínea sobre toda la salida.
+    # Captura el AID de "ont-<aid>" al inicio (sin el prefijo) y el float final
+    # (tolerante a alarmas "++", "-", etc. entre medias).
+    # (flags inline "(?im)" para que el patrón valga tanto en re como en re2)
+    # Patrón bytes: se aplica sobre la salida cruda y solo se decodifican los grupos casados.
+    _DDMI_ONT_RX_MULTILINE_RE = _re_hot.compile(
+        rb"(?im)^[ \t]*ont-(\d+(?:-\d+){2,})[ \t]+(?:\S+[ \t]+)?([+-]?\d+(?:\.\d+)?)[ \t\r]*$"
+    )
 
     def __init__(
         self,
@@ -86,6 +251,8 @@ class APIOLT1240XA:
         debug_telnet_raw_file: Optional[str] = "/tmp/olt1240xa_telnet_raw.log",
         eol: bytes = b"\r\n",
         ddmi_timeout: int = 120,  # ddmi status puede tardar bastante
+        ddmi_cache_ttl: float = 30.0,  # segundos; 0 desactiva la caché de Rx por slot
+        ddmi_parallel: bool = True,  # DDMI multi-slot en sesiones Telnet adicionales
     ):
         self.host = host
         self.port = port
@@ -95,6 +262,11 @@ class APIOLT1240XA:
         self.prompt = prompt
         self.timeout = timeout
         self.ddmi_timeout = ddmi_timeout
+        self.ddmi_cache_ttl = ddmi_cache_ttl
+        self.ddmi_parallel = ddmi_parallel
+
+        # Caché DDMI por slot: {slot: (timestamp, rx_map)}
+        self._ddmi_cache: Dict[int, Tuple[float, Dict[str, str]]] = {}
 
         self.login_user_prompt = login_user_prompt
         self.login_pass_prompt = login_pass_prompt
@@ -103,16 +275,34 @@ class APIOLT1240XA:
         self.debug_telnet_raw_file = debug_telnet_raw_file
         self.eol = eol
 
-        # Prompt detection robusto
-        self._prompt_end_re = re.compile(re.escape(self.prompt).encode("ascii") + rb"\s*$")
-        self._prompt_only_re = re.compile(rb"^\s*" + re.escape(self.prompt).encode("ascii") + rb"\s*$")
+        # Sin debug, _d/_dump_telnet no hacen nada: se sustituyen en la instancia por no-ops
+        # (ahorra la llamada + comprobación en cada lectura). "debug" se fija al construir.
+        if not self.debug:
+            self._d = lambda msg: None
+        if not self.debug or not (self.debug_telnet_dump or self.debug_telnet_raw_file):
+            # debug solo con trazas _d(): tampoco hay volcado que hacer
+            self._dump_telnet = lambda context, raw: None
+
+        # Prompt detection robusto (bytes del prompt codificados una sola vez)
+        self._prompt_bytes = self.prompt.encode("ascii")
+        self._prompt_end_re = _compile_prompt_end_re(self._prompt_bytes)
+
+        self.tn = RawTelnet()
 
-        self.tn = telnetlib.Telnet()
+        # True cuando la última lectura terminó limpiamente en prompt (permite saltar el resync)
+        self._last_prompt_clean = False
+
+        # prefijo de ESC[6n pendiente al final del último chunk (ver _ansi_autoreply)
+        self._ansi_carry = b""
+
+        # fichero RAW de debug (debug_telnet_raw_file), abierto en el primer volcado
+        self._raw_fp: Optional[BinaryIO] = None
 
         self._d(
             "Init APIOLT1240XA "
             f"(host={self.host}, port={self.port}, timeout={self.timeout}, "
-            f"ddmi_timeout={self.ddmi_timeout}, "
+            f"ddmi_timeout={self.ddmi_timeout}, ddmi_cache_ttl={self.ddmi_cache_ttl}, "
+            f"ddmi_parallel={self.ddmi_parallel}, "
             f"prompt={self.prompt!r}, debug={self.debug}, "
             f"debug_telnet_dump={self.debug_telnet_dump}, "
             f"debug_telnet_raw_file={self.debug_telnet_raw_file!r}, "
@@ -132,6 +322,9 @@ class APIOLT1240XA:
             print(f"[{self._ts()}] [DEBUG] {msg}")
 
     def _strip_ansi(self, raw: bytes) -> bytes:
+        # Caso común: salida CLI limpia, sin ESC -> no pasar por el motor regex
+        if b"\x1b" not in raw:
+            return raw
         return self.ANSI_RE.sub(b"", raw)
 
     def _dump_telnet(self, context: str, raw: bytes) -> None:
@@ -140,21 +333,20 @@ class APIOLT1240XA:
 
         if self.debug_telnet_raw_file:
             try:
-                with open(self.debug_telnet_raw_file, "ab") as f:
-                    header = f"\n\n===== {self._ts()} {context} =====\n".encode("utf-8", errors="ignore")
-                    f.write(header)
-                    f.write(raw)
+                if self._raw_fp is None:
+                    # se abre una sola vez por sesión (escritura con buffer); se vuelca en close()
+                    self._raw_fp = open(self.debug_telnet_raw_file, "ab", buffering=64 * 1024)
+                header = f"\n\n===== {self._ts()} {context} =====\n".encode("utf-8", errors="ignore")
+                self._raw_fp.write(header)
+                self._raw_fp.write(raw)
             except Exception as e:
                 self._d(f"_dump_telnet: error escribiendo RAW a fichero => {e!r}")
 
         if not self.debug_telnet_dump:
             return
 
-        try:
-            safe = self._strip_ansi(raw)
-            txt = safe.decode("latin-1", errors="strict")
-        except Exception:
-            txt = raw.decode("utf-8", errors="replace")
+        # solo se filtra ANSI cuando realmente se va a imprimir; latin-1 decodifica cualquier byte
+        txt = self._strip_ansi(raw).decode("latin-1")
 
         sys.stdout.write(txt)
         sys.stdout.flush()
@@ -166,6 +358,12 @@ class APIOLT1240XA:
     # ANSI/VT100 autoresponse
     # -----------------------------
     def _ansi_autoreply(self, data: bytes) -> None:
+        if self._ansi_carry:
+            # ESC[6n partido entre dos chunks: se completa con el principio del siguiente
+            data = self._ansi_carry + data
+            self._ansi_carry = b""
+        if b"\x1b" not in data:
+            return
         # Algunos equipos consultan posición del cursor con ESC[6n.
         # Si no respondes, la CLI puede quedarse a medias.
         if b"\x1b[6n" in data:
@@ -174,6 +372,11 @@ class APIOLT1240XA:
                 self.tn.write(b"\x1b[1;1R")
             except Exception as e:
                 self._d(f"Error enviando respuesta ANSI => {e!r}")
+        # consulta incompleta al final del chunk: se guarda para el siguiente (solo se miran 3 bytes)
+        for n in (3, 2, 1):
+            if data.endswith(b"\x1b[6n"[:n]):
+                self._ansi_carry = data[-n:]
+                break
 
     # -----------------------------
     # Sesión / IO
@@ -181,6 +384,9 @@ class APIOLT1240XA:
     def _open_session(self) -> None:
         self._d("Abriendo sesión Telnet...")
         self.tn.open(self.host, self.port, timeout=self.timeout)
+        if self.debug:
+            # valores leídos del socket: _tune_socket es best-effort y el SO puede ignorarlos
+            self._d(f"Socket abierto: {self.tn.socket_options()}")
 
         self._d("Esperando prompt de usuario...")
         _ = self.tn.read_until(self.login_user_prompt, timeout=self.timeout)
@@ -203,28 +409,73 @@ class APIOLT1240XA:
 
         self._d("Sesión iniciada (si hay prompt visible en dumps).")
 
+    def _wait_readable(self, timeout: float) -> bool:
+        """
+        Bloquea hasta que el socket telnet tenga datos o venza timeout (en lugar de time.sleep fijo).
+        Devuelve False solo si select confirma que no llegó nada.
+        """
+        if timeout <= 0:
+            return False
+        try:
+            return bool(select.select([self.tn.get_socket()], [], [], timeout)[0])
+        except (OSError, ValueError):
+            # socket cerrado / no disponible: mantener el comportamiento de espera
+            time.sleep(timeout)
+            return True
+
     def _drain_input(self, drain_for: float = 0.25) -> bytes:
-        end = time.time() + drain_for
-        buf = b""
-        while time.time() < end:
-            chunk = self.tn.read_very_eager()
+        """
+        Descarta/recoge bytes pendientes durante como mucho drain_for (se alarga si siguen
+        llegando datos); termina antes si la línea queda en silencio DRAIN_QUIET segundos.
+        """
+        end = time.monotonic() + drain_for
+        buf = bytearray()
+        read = self.tn.read_very_eager
+        autoreply = self._ansi_autoreply
+        while time.monotonic() < end:
+            chunk = read()
             if chunk:
-                self._ansi_autoreply(chunk)
+                autoreply(chunk)
                 buf += chunk
-                end = max(end, time.time() + 0.05)
-            else:
-                time.sleep(0.02)
-        if buf:
-            self._dump_telnet("DRAIN", buf)
-        return buf
+                end = max(end, time.monotonic() + 0.05)
+            elif not self._wait_readable(min(self.DRAIN_QUIET, end - time.monotonic())):
+                # línea en silencio DRAIN_QUIET segundos: no hace falta agotar drain_for
+                break
+        out = bytes(buf)
+        if out:
+            self._dump_telnet("DRAIN", out)
+        return out
 
     def _has_real_progress(self, buf: bytes) -> bool:
-        tmp = buf.strip(b"\r\n\t ")
-        if not tmp:
+        # progreso real = algo distinto de whitespace y/o el prompt solo.
+        # Equivale a buf.strip() not in (b"", prompt) sin copiar el buffer: se recorre el
+        # whitespace de ambos extremos y solo se compara si la longitud coincide con el prompt.
+        n = len(buf)
+        lo = 0
+        while lo < n and buf[lo] in _WS_BYTES:
+            lo += 1
+        hi = n
+        while hi > lo and buf[hi - 1] in _WS_BYTES:
+            hi -= 1
+        if hi == lo:
             return False
-        if self._prompt_only_re.match(tmp):
-            return False
-        return True
+        prompt = self._prompt_bytes
+        return hi - lo != len(prompt) or buf[lo:hi] != prompt
+
+    def _prompt_start(self, raw: bytes) -> int:
+        """
+        Posición del prompt final de raw (admite whitespace detrás) o -1.
+        Equivale a _prompt_end_re.search(raw.rstrip(b"\r\n")) pero sin regex ni copia del buffer.
+        """
+        prompt = self._prompt_bytes
+        if not prompt or prompt[-1:].isspace():
+            # prompt terminado en whitespace: el recorte manual sería ambiguo, se usa la regex
+            m = self._prompt_end_re.search(raw.rstrip(b"\r\n"))
+            return m.start() if m else -1
+        end = len(raw)
+        while end and raw[end - 1] in _WS_BYTES:
+            end -= 1
+        return end - len(prompt) if raw.endswith(prompt, 0, end) else -1
 
     def _read_until_prompt(
         self,
@@ -236,36 +487,48 @@ class APIOLT1240XA:
         if timeout is None:
             timeout = self.timeout
 
-        end_time = time.time() + timeout
-        buf = b""
+        end_time = time.monotonic() + timeout
+        # bytearray: extend in-place (evita el O(N^2) de bytes += chunk en salidas largas)
+        buf = bytearray()
+        # el prompt solo puede estar al final: basta con mirar la cola del buffer
+        tail_len = len(self.prompt) + 64
         saw_progress = not require_progress
+        prompt = self._prompt_bytes
 
         last_stat = 0.0
-        while time.time() < end_time:
-            chunk = self.tn.read_very_eager()
+        read = self.tn.read_very_eager
+        autoreply = self._ansi_autoreply
+        while time.monotonic() < end_time:
+            chunk = read()
             if chunk:
-                self._ansi_autoreply(chunk)
+                autoreply(chunk)
                 buf += chunk
 
                 if not saw_progress and self._has_real_progress(buf):
                     saw_progress = True
 
-                now = time.time()
-                if self.debug and (now - last_stat) >= 0.8:
-                    last_stat = now
-                    self._d(f"_read_until_prompt({context}): bytes={len(buf)} saw_progress={saw_progress}")
+                if self.debug:
+                    now = time.monotonic()
+                    if (now - last_stat) >= 0.8:
+                        last_stat = now
+                        self._d(f"_read_until_prompt({context}): bytes={len(buf)} saw_progress={saw_progress}")
 
-                if self._prompt_end_re.search(buf.rstrip(b"\r\n")):
+                # prompt al final del buffer (ignorando whitespace) sin pasar por regex
+                if buf[-tail_len:].rstrip().endswith(prompt):
                     if require_progress and not saw_progress:
                         continue
-                    return buf
+                    self._last_prompt_clean = True
+                    return bytes(buf)
             else:
-                time.sleep(0.05)
+                # sin datos: bloquear en el socket hasta que lleguen bytes o venza el timeout
+                self._wait_readable(end_time - time.monotonic())
 
         self._d(f"_read_until_prompt({context}): TIMEOUT (bytes={len(buf)})")
-        if buf:
-            self._dump_telnet(f"{context}-TIMEOUT-BUF", buf)
-        return buf
+        self._last_prompt_clean = False
+        out = bytes(buf)
+        if out:
+            self._dump_telnet(f"{context}-TIMEOUT-BUF", out)
+        return out
 
     def _resync_cli(self) -> None:
         self.tn.write(self.eol)
@@ -273,36 +536,215 @@ class APIOLT1240XA:
         self._dump_telnet("RESYNC", buf)
         _ = self._drain_input(drain_for=0.15)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _encode_command(command: str, eol: bytes) -> bytes:
+        """
+        Bytes de comando + EOL listos para enviar (cacheado: los mismos comandos se repiten por sesión/AID).
+        """
+        return command.encode("ascii", errors="ignore") + eol
+
+    def _ensure_clean_prompt(self) -> None:
+        # comando encadenado tras un prompt limpio y sin bytes pendientes: se salta el resync
+        clean = self._last_prompt_clean and not self._drain_input(drain_for=0.02)
+        if not clean:
+            self._resync_cli()
+            _ = self._drain_input(drain_for=0.2)
+        # se invalida hasta que este comando vuelva a leer un prompt (también ante excepciones)
+        self._last_prompt_clean = False
+
+    def _begin_command(self, command: str, timeout: int) -> None:
+        """
+        Resync (si hace falta) + envío del comando; común a las variantes de _send_command.
+        """
+        self._ensure_clean_prompt()
+        if self.debug:
+            self._d(f"CMD => {command!r} timeout={timeout}")
+        self.tn.write(self._encode_command(command, self.eol))
+
+    def _send_command_bytes(self, command: str, *, timeout: Optional[int] = None) -> bytes:
+        """
+        Ejecuta comando y devuelve la salida cruda (bytes) sin el prompt final ni secuencias ANSI.
+        El eco del comando y los saltos de línea se dejan tal cual.
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        self._begin_command(command, timeout)
+
+        raw = self._read_until_prompt(timeout=timeout, require_progress=True, context=f"CMD:{command}")
+        self._dump_telnet(f"CMD OUTPUT: {command}", raw)
+
+        k = self._prompt_start(raw)
+        # secuencias ANSI fuera una sola vez aquí: los parsers reciben texto limpio
+        return self._strip_ansi(raw[:k] if k >= 0 else raw)
+
     def _send_command(self, command: str, *, timeout: Optional[int] = None) -> str:
         """
         Ejecuta comando y devuelve salida sin prompt final y sin eco del comando.
         Permite timeout específico (p.e. ddmi).
         """
+        raw_wo_prompt = self._send_command_bytes(command, timeout=timeout)
+        return self._strip_echo(self._decode_lines(raw_wo_prompt), command)[0]
+
+    @staticmethod
+    def _strip_echo(out: str, command: str) -> Tuple[str, bool]:
+        """
+        Quita vacíos iniciales y el eco del comando mirando solo el principio (sin
+        splitlines/join de toda la salida). Devuelve (texto, si había eco).
+        """
+        n = len(out)
+        pos = 0
+        echoed = False
+        while pos < n:
+            nl = out.find("\n", pos)
+            end = n if nl < 0 else nl
+            first = out[pos:end].strip()
+            if first:
+                if first == command.strip():
+                    pos = end + 1
+                    echoed = True
+                break
+            pos = end + 1
+
+        return out[pos:].strip("\n"), echoed
+
+    def send_commands(self, commands: List[str], *, timeout: Optional[int] = None) -> List[str]:
+        """
+        Ejecuta varios comandos con un único write (pipelining: 1 RTT en lugar de N) y
+        reparte la salida por prompts. Devuelve una salida por comando, igual que _send_command.
+        Si la salida no cuadra (menos prompts o un eco que no corresponde), se repite
+        comando a comando.
+        """
+        if len(commands) < 2:
+            return [self._send_command(c, timeout=timeout) for c in commands]
         if timeout is None:
             timeout = self.timeout
 
-        self._resync_cli()
-        _ = self._drain_input(drain_for=0.2)
+        self._ensure_clean_prompt()
+        self._d(f"CMDS => {commands!r} timeout={timeout}")
+        self.tn.write(b"".join(self._encode_command(c, self.eol) for c in commands))
 
-        self._d(f"CMD => {command!r} timeout={timeout}")
-        self.tn.write(command.encode("ascii", errors="ignore") + self.eol)
+        raw = self._read_until_prompts(len(commands), timeout=timeout * len(commands))
+        self._dump_telnet(f"CMDS OUTPUT: {commands!r}", raw)
 
-        raw = self._read_until_prompt(timeout=timeout, require_progress=True, context=f"CMD:{command}")
-        self._dump_telnet(f"CMD OUTPUT: {command}", raw)
+        parts = self._strip_ansi(raw).split(self._prompt_bytes)
+        outs: List[str] = []
+        if len(parts) > len(commands):
+            for command, part in zip(commands, parts):
+                out, echoed = self._strip_echo(self._decode_lines(part), command)
+                if not echoed:
+                    break
+                outs.append(out)
+
+        if len(outs) == len(commands):
+            return outs
+
+        self._d("send_commands: salida desalineada; se repite comando a comando")
+        self._last_prompt_clean = False
+        return [self._send_command(c, timeout=timeout) for c in commands]
+
+    def _read_until_prompts(self, count: int, *, timeout: float) -> bytes:
+        """
+        Como _read_until_prompt, pero espera `count` prompts (uno por comando encadenado),
+        el último al final del buffer.
+        """
+        end_time = time.monotonic() + timeout
+        buf = bytearray()
+        tail_len = len(self.prompt) + 64
+        prompt = self._prompt_bytes
+        seen = 0
+        search_from = 0
+
+        read = self.tn.read_very_eager
+        autoreply = self._ansi_autoreply
+        while time.monotonic() < end_time:
+            chunk = read()
+            if not chunk:
+                self._wait_readable(end_time - time.monotonic())
+                continue
+
+            autoreply(chunk)
+            buf += chunk
+
+            while True:
+                k = buf.find(prompt, search_from)
+                if k < 0:
+                    break
+                seen += 1
+                search_from = k + len(prompt)
+            # un prompt puede quedar partido entre dos chunks: se vuelve a mirar la cola
+            search_from = max(search_from, len(buf) - len(prompt) + 1)
+
+            if seen >= count and buf[-tail_len:].rstrip().endswith(prompt):
+                self._last_prompt_clean = True
+                return bytes(buf)
+
+        self._d(f"_read_until_prompts({count}): TIMEOUT (bytes={len(buf)}, prompts={seen})")
+        self._last_prompt_clean = False
+        return bytes(buf)
+
+    @staticmethod
+    def _decode_lines(raw: bytes) -> str:
+        return raw.decode("latin-1").replace("\r\n", "\n").replace("\r", "\n")
+
+    def _send_command_stream(self, command: str, *, timeout: Optional[int] = None) -> Iterator[str]:
+        """
+        Como _send_command, pero entrega la salida por bloques de líneas completas (str con
+        saltos "\n") según llegan del socket, sin acumular la salida entera en memoria.
+        El prompt final y las secuencias ANSI no se entregan; el eco del comando sí (los parsers de tabla lo ignoran).
+        Misma detección de fin que _read_until_prompt (cola del buffer + progreso real).
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        self._begin_command(command, timeout)
+
+        end_time = time.monotonic() + timeout
+        tail_len = len(self.prompt) + 64
+        tail = b""  # equivalente a buf[-tail_len:] de _read_until_prompt
+        carry = bytearray()  # línea incompleta pendiente
+        head: Optional[bytearray] = bytearray()  # solo hasta ver progreso real
+        total = 0
+
+        read = self.tn.read_very_eager
+        autoreply = self._ansi_autoreply
+        while time.monotonic() < end_time:
+            chunk = read()
+            if not chunk:
+                self._wait_readable(end_time - time.monotonic())
+                continue
+
+            autoreply(chunk)
+            if self.debug:
+                self._dump_telnet(f"CMD STREAM: {command}", chunk)
+            total += len(chunk)
+            carry += chunk
+            tail = (tail + chunk)[-tail_len:]
 
-        m = self._prompt_end_re.search(raw.rstrip(b"\r\n"))
-        raw_wo_prompt = raw[: m.start()] if m else raw
+            if head is not None:
+                head += chunk
+                if self._has_real_progress(head):
+                    head = None
 
-        out = raw_wo_prompt.decode("latin-1", errors="ignore")
+            if head is None and tail.rstrip().endswith(self._prompt_bytes):
+                self._last_prompt_clean = True
+                break
 
-        # limpiar eco del comando y vacíos iniciales
-        lines = out.splitlines()
-        while lines and not lines[0].strip():
-            lines.pop(0)
-        if lines and lines[0].strip() == command.strip():
-            lines.pop(0)
+            nl = carry.rfind(b"\n")
+            if nl >= 0:
+                # una secuencia ANSI no cruza "\n": se puede limpiar por bloques de líneas
+                yield self._decode_lines(self._strip_ansi(carry[: nl + 1]))
+                del carry[: nl + 1]
+        else:
+            self._d(f"_send_command_stream({command!r}): TIMEOUT (bytes={total})")
+            self._last_prompt_clean = False
 
-        return "\n".join(lines).strip("\n")
+        k = self._prompt_start(carry)
+        if k >= 0:
+            del carry[k:]
+        if carry:
+            yield self._decode_lines(self._strip_ansi(carry))
 
     # -----------------------------
     # DDMI helpers (ONT Rx)
@@ -326,37 +768,120 @@ class APIOLT1240XA:
 
         return sorted(slots)
 
-    def _get_ddmi_rx_map_for_slot(self, slot: int) -> Dict[str, str]:
+    def _get_ddmi_rx_map_for_slot(self, slot: int, *, bypass_cache: bool = False) -> Dict[str, str]:
         """
         Ejecuta:
           show interface gpon <slot>-* ddmi status
-        y devuelve { "ont-<aid>": "<rx>" } para ese slot.
+        y devuelve { "<aid>": "<rx>" } para ese slot (AID sin prefijo "ont-", como en filter).
+
+        El resultado se cachea ddmi_cache_ttl segundos (el comando puede tardar minutos).
         """
+        if not bypass_cache:
+            cached = self._ddmi_cache_get(slot)
+            if cached is not None:
+                self._d(f"_get_ddmi_rx_map_for_slot({slot}): cache hit ({len(cached)} ONTs).")
+                return cached
+
         cmd = f"show interface gpon {slot}-* ddmi status"
         self._d(f"_get_ddmi_rx_map_for_slot: {cmd!r} (timeout={self.ddmi_timeout})")
-        raw = self._send_command(cmd, timeout=self.ddmi_timeout)
+        raw = self._send_command_bytes(cmd, timeout=self.ddmi_timeout)
 
-        rx_map: Dict[str, str] = {}
-        for line in raw.splitlines():
-            s = line.rstrip("\r")
-            m_id = self._DDMI_ONT_ID_RE.match(s)
-            if not m_id:
-                continue
-            ont = m_id.group("ont").strip()
-            m_rx = self._DDMI_LAST_FLOAT_RE.search(s.strip())
-            if not m_rx:
-                continue
-            rx = m_rx.group("rx").strip()
-            rx_map[ont] = rx
+        # CR sueltos -> LF (las líneas vacías extra de "\r\n" no casan con el patrón);
+        # el eco del comando tampoco casa, así que no hace falta decodificar la salida entera.
+        rx_map: Dict[str, str] = {
+            aid.decode("ascii"): rx.decode("ascii")
+            for aid, rx in self._DDMI_ONT_RX_MULTILINE_RE.findall(raw.replace(b"\r", b"\n"))
+        }
 
         self._d(f"_get_ddmi_rx_map_for_slot({slot}): {len(rx_map)} ONTs parseadas.")
+        self._ddmi_cache_put(slot, rx_map)
         return rx_map
 
-    def _get_ddmi_rx_map_for_slots(self, slots: List[int]) -> Dict[str, str]:
+    def _ddmi_cache_get(self, slot: int) -> Optional[Dict[str, str]]:
+        if self.ddmi_cache_ttl <= 0:
+            return None
+        entry = self._ddmi_cache.get(slot)
+        if entry and time.monotonic() - entry[0] < self.ddmi_cache_ttl:
+            return entry[1]
+        return None
+
+    def _ddmi_cache_put(self, slot: int, rx_map: Dict[str, str]) -> None:
+        # un mapa vacío suele ser timeout/salida incompleta: no se cachea
+        if rx_map and self.ddmi_cache_ttl > 0:
+            self._ddmi_cache[slot] = (time.monotonic(), rx_map)
+
+    def _fetch_slot_ddmi(self, slot: int) -> Optional[Dict[str, str]]:
+        """
+        DDMI de un slot en una sesión Telnet adicional (login propio, se cierra al terminar).
+        None si la sesión no se pudo abrir (p.ej. límite de sesiones CLI de la OLT).
+        Hereda la config de debug; el volcado RAW va a "<debug_telnet_raw_file>.slot<N>" para que
+        cada fichero tenga un solo escritor (los workers corren a la vez, cada uno con su buffer).
+        """
+        raw_file = f"{self.debug_telnet_raw_file}.slot{slot}" if self.debug_telnet_raw_file else None
+        try:
+            worker = type(self)(
+                self.host,
+                self.port,
+                self.username,
+                self.password,
+                prompt=self.prompt,
+                timeout=self.timeout,
+                login_user_prompt=self.login_user_prompt,
+                login_pass_prompt=self.login_pass_prompt,
+                debug=self.debug,
+                debug_telnet_dump=self.debug_telnet_dump,
+                debug_telnet_raw_file=raw_file,
+                eol=self.eol,
+                ddmi_timeout=self.ddmi_timeout,
+                ddmi_cache_ttl=0,
+                ddmi_parallel=False,
+            )
+        except Exception as e:
+            self._d(f"DDMI slot={slot}: no se pudo abrir sesión adicional => {e!r}")
+            return None
+        try:
+            return worker._get_ddmi_rx_map_for_slot(slot, bypass_cache=True)
+        finally:
+            worker.close()
+
+    def _fetch_ddmi_parallel(self, slots: List[int], *, bypass_cache: bool) -> Dict[int, Dict[str, str]]:
+        """
+        Lanza en paralelo (una sesión por slot, máx. 4) los slots sin caché válida.
+        Devuelve {slot: rx_map} de los que terminaron con datos; el resto queda para la sesión principal.
+        """
+        todo = [s for s in slots if bypass_cache or self._ddmi_cache_get(s) is None]
+        if len(todo) < 2:
+            return {}
+
+        self._d(f"_fetch_ddmi_parallel: slots={todo}")
+        fetched: Dict[int, Dict[str, str]] = {}
+        with ThreadPoolExecutor(max_workers=min(len(todo), 4)) as ex:
+            futures = [(slot, ex.submit(self._fetch_slot_ddmi, slot)) for slot in todo]
+            for slot, fut in futures:
+                try:
+                    rx_map = fut.result()
+                except Exception as e:
+                    self._d(f"DDMI slot={slot} (paralelo): error => {e!r}")
+                    continue
+                # sin sesión o mapa vacío (login/timeout en la sesión extra): reintento en la principal
+                if not rx_map:
+                    continue
+                self._ddmi_cache_put(slot, rx_map)
+                fetched[slot] = rx_map
+        return fetched
+
+    def _get_ddmi_rx_map_for_slots(self, slots: List[int], *, bypass_cache: bool = False) -> Dict[str, str]:
+        fetched: Dict[int, Dict[str, str]] = {}
+        if self.ddmi_parallel and len(slots) > 1:
+            fetched = self._fetch_ddmi_parallel(slots, bypass_cache=bypass_cache)
+
         merged: Dict[str, str] = {}
         for slot in slots:
+            if slot in fetched:
+                merged.update(fetched[slot])
+                continue
             try:
-                merged.update(self._get_ddmi_rx_map_for_slot(slot))
+                merged.update(self._get_ddmi_rx_map_for_slot(slot, bypass_cache=bypass_cache))
             except Exception as e:
                 self._d(f"DDMI slot={slot}: error => {e!r}")
         self._d(f"_get_ddmi_rx_map_for_slots: total {len(merged)} ONTs en mapa Rx.")
@@ -365,22 +890,28 @@ class APIOLT1240XA:
     # -----------------------------
     # API pública
     # -----------------------------
-    def get_all_onts(self, filter: str, *, enrich_rx: bool = True) -> List[Dict[str, Any]]:
+    def get_all_onts(
+        self,
+        filter: str,
+        *,
+        enrich_rx: bool = True,
+        bypass_cache: bool = False,
+    ) -> List[Dict[str, Any]]:
         """
         show interface remote ont filter <filter>
 
         Enrich Rx:
           - infiere slot(s) desde los AIDs (p.ej. 1-..., 5-...)
           - ejecuta ddmi status por slot: show interface gpon <slot>-* ddmi status
+            (cacheado ddmi_cache_ttl segundos; bypass_cache=True fuerza la consulta)
           - añade "ONT Rx"
         """
-        raw = self._send_command(f"show interface remote ont filter {filter}")
-        onts = self._parse_all_onts_filter(raw)
+        onts = self._parse_all_onts_stream(self._send_command_stream(f"show interface remote ont filter {filter}"))
 
         if enrich_rx and onts:
             slots = self._infer_slots_from_onts(onts, filter_value=filter)
             self._d(f"Enrich Rx: slots inferidos => {slots}")
-            rx_map = self._get_ddmi_rx_map_for_slots(slots)
+            rx_map = self._get_ddmi_rx_map_for_slots(slots, bypass_cache=bypass_cache)
 
             # aplicar enrichment sin “romper” si no hay match
             for rec in onts:
@@ -388,11 +919,7 @@ class APIOLT1240XA:
                 if not aid:
                     rec.setdefault("ONT Rx", "")
                     continue
-                key = f"ont-{aid}"
-                if key in rx_map and rx_map[key] != "":
-                    rec["ONT Rx"] = rx_map[key]
-                else:
-                    rec.setdefault("ONT Rx", "")
+                rec["ONT Rx"] = rx_map.get(aid) or ""
 
         return onts
 
@@ -415,10 +942,41 @@ class APIOLT1240XA:
         raw = self._send_command(f"show interface remote ont {aid_norm} config")
         return self._parse_config_1240xa(aid_norm, raw)
 
+    def get_ont_full(self, aid: str) -> Dict[str, Any]:
+        """
+        status + status-history + config de un AID en un solo envío (send_commands).
+        Devuelve {"details": ..., "status_history": ..., "config": ...} con los mismos
+        formatos que get_ont_details / get_ont_status_history / get_ont_config.
+        """
+        aid_norm = self._normalize_aid(aid)
+        raw_details, raw_hist, raw_config = self.send_commands([
+            f"show interface remote ont {aid_norm} status",
+            f"show interface remote ont {aid_norm} status-history",
+            f"show interface remote ont {aid_norm} config",
+        ])
+        return {
+            "details": self._parse_kv_colon_blocks(raw_details),
+            "status_history": self._parse_status_history(raw_hist),
+            "config": self._parse_config_1240xa(aid_norm, raw_config),
+        }
+
     # -----------------------------
     # Parsing helpers
     # -----------------------------
-    def _normalize_aid(self, aid: str) -> str:
+    @staticmethod
+    def _is_sep_line(s: str) -> bool:
+        """
+        Separador de tabla ("-----+-----") en una línea ya "stripped". Equivale, sin regex, a
+        re.match(r"^\s*-+\s*\+\s*-+.*$", s).
+        """
+        if not s.startswith("-"):
+            return False
+        t = s.lstrip("-").lstrip()
+        return t.startswith("+") and t[1:].lstrip().startswith("-")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _normalize_aid(aid: str) -> str:
         a = aid.strip()
         if a.startswith("ont-"):
             a = a[4:]
@@ -430,28 +988,14 @@ class APIOLT1240XA:
           Pon_AID | Type SN Password Status
           pon-x-y | UnReg <SN> DEFAULT Active
         """
-        lines = [l.rstrip("\r") for l in raw.splitlines() if l.strip()]
         rows: List[Dict[str, Any]] = []
 
-        for line in lines:
-            s = line.rstrip()
-
-            if self.SEP_RE.match(s.strip()):
-                continue
-            if s.strip().startswith("Pon_AID"):
-                continue
-            if "|" not in s:
-                continue
-
-            left, right = s.split("|", 1)
-            pon_aid = left.strip()
-            right = right.strip()
-
-            if not pon_aid.startswith("pon-"):
-                continue
+        # solo casan filas "pon-..." con "|": cabecera, separadores y vacías se descartan en el regex
+        for lm in self._UNREG_LINE_RE.finditer(raw):
+            pon_aid = lm.group("pon")
+            right = lm.group("right").strip()
 
-            right_norm = " ".join(right.split())
-            m = self._UNREG_ROW_RE.match(right_norm)
+            m = self._UNREG_ROW_RE.match(right)
             if not m:
                 rows.append({"Pon_AID": pon_aid, "raw": right})
                 continue
@@ -474,22 +1018,19 @@ class APIOLT1240XA:
         Tolera prefijos con "|" y separadores.
         """
         details: Dict[str, Any] = {}
+        is_sep = self._is_sep_line
         for line in raw.splitlines():
-            s = line.strip()
-            if not s:
+            # sin ":" no hay par clave/valor (descarta también vacías y separadores)
+            if ":" not in line:
                 continue
-            if self.SEP_RE.match(s):
-                continue
-
-            s = s.lstrip("|").strip()
-            if ":" not in s:
+            s = line.strip()
+            if is_sep(s):
                 continue
 
-            key, val = s.split(":", 1)
-            k = key.strip()
-            v = val.strip()
+            k, _, v = s.lstrip("|").partition(":")
+            k = k.strip()
             if k:
-                details[k] = v
+                details[k] = v.strip()
 
         return details
 
@@ -499,16 +1040,19 @@ class APIOLT1240XA:
           AID | Status Time
           ont-2-16-40 | 1 IS 2026/ 1/14 16:16:27
         """
-        lines = [l.rstrip("\r") for l in raw.splitlines() if l.strip()]
         history: List[Dict[str, Any]] = []
+        # sin "|" no hay filas posibles (p.ej. ONT recién dada de alta, historial vacío)
+        if "|" not in raw:
+            return history
 
-        for line in lines:
+        is_sep = self._is_sep_line
+        for line in raw.splitlines():
             s = line.strip()
-            if self.SEP_RE.match(s):
+            if "|" not in s:
                 continue
             if s.startswith("AID") and "Status" in s and "Time" in s:
                 continue
-            if "|" not in s:
+            if is_sep(s):
                 continue
 
             _, right = s.split("|", 1)
@@ -530,11 +1074,7 @@ class APIOLT1240XA:
         """
         Segmento típico: "<image> [V] [V] <version>"
         """
-        ss = " ".join(s.split())
-        if not ss:
-            return "", "", ""
-
-        toks = ss.split()
+        toks = s.split()
         if not toks:
             return "", "", ""
 
@@ -549,44 +1089,40 @@ class APIOLT1240XA:
         version = ""
         if rest:
             cand = rest[0]
-            if re.fullmatch(r"V[0-9A-Za-z._-]{3,}", cand):
+            if self._FW_VERSION_RE.fullmatch(cand):
                 version = cand
 
         return image, active, version
 
-    def _parse_remote_ont_filter_row(self, line: str, *, last_aid: Optional[str]) -> Optional[Dict[str, Any]]:
+    def _parse_remote_ont_filter_row(
+        self,
+        aid: str,
+        mid: str,
+        imgver: str,
+        vend_model: str,
+        *,
+        last_aid: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
         """
-        Parsea una línea de tabla:
+        Parsea las columnas (ya "stripped") de una línea de tabla:
           AID | Type SN Password Status | Image Active Version | Vendor/Model
 
         La línea "continuación" de Actual suele venir con AID vacío (hereda last_aid).
         """
-        parts = [p.strip() for p in line.split("|")]
-        while len(parts) < 4:
-            parts.append("")
-
-        aid = parts[0].strip()
-        mid = parts[1].strip()
-        imgver = parts[2].strip()
-        vend_model = parts[3].strip()
 
         if not aid:
             if not last_aid:
                 return None
             aid = last_aid
 
-        if not self.AID_RE.match(aid):
-            return None
-
-        mid_norm = " ".join(mid.split())
-        if not mid_norm:
+        # misma forma que AID_RE (>= 3 segmentos numéricos) sin invocar el motor regex por fila
+        segs = aid.split("-")
+        if len(segs) < 3 or not all(p.isdecimal() for p in segs):
             return None
 
-        tokens = mid_norm.split()
-        if not tokens:
-            return None
-
-        if tokens[0] not in ("Config", "Actual"):
+        # split() sin argumentos ya colapsa espacios: no hace falta normalizar antes
+        tokens = mid.split()
+        if not tokens or tokens[0] not in ("Config", "Actual"):
             return None
 
         row_type = tokens[0]
@@ -594,8 +1130,9 @@ class APIOLT1240XA:
 
         # buscar SN
         sn_idx = None
+        hexset = self._HEXSET
         for i, tok in enumerate(tokens):
-            if re.fullmatch(r"[0-9A-Fa-f]{8,32}", tok):
+            if 8 <= len(tok) <= 32 and all(c in hexset for c in tok):
                 sn_idx = i
                 break
 
@@ -624,7 +1161,7 @@ class APIOLT1240XA:
             payload["Version"] = version
 
         if vend_model:
-            if re.fullmatch(r"[A-Z]{3,8}", vend_model):
+            if 3 <= len(vend_model) <= 8 and all(c in self._VENDOR_CHARS for c in vend_model):
                 payload["Vendor"] = vend_model
             else:
                 payload["Model"] = vend_model
@@ -632,25 +1169,10 @@ class APIOLT1240XA:
         return {"AID": aid, "_row_type": row_type, "_row_payload": payload}
 
     def _apply_chosen_row_to_record(self, rec: Dict[str, Any], chosen: Dict[str, Any]) -> None:
-        for k in ("SN", "Password", "Status"):
-            if k in chosen and chosen[k] != "":
-                rec[k] = chosen[k]
-
-        if "Model" in chosen and chosen["Model"]:
-            rec["Model"] = chosen["Model"]
-        if "Vendor" in chosen and chosen["Vendor"]:
-            rec["Vendor"] = chosen["Vendor"]
-
-        if "Version" in chosen and chosen["Version"]:
-            rec["FW Version"] = chosen["Version"]
-
-        if "Type" in chosen and chosen["Type"]:
-            rec["Type"] = chosen["Type"]
-
-        if "Image" in chosen and chosen["Image"]:
-            rec["Image"] = chosen["Image"]
-        if "Active" in chosen and chosen["Active"]:
-            rec["Active"] = chosen["Active"]
+        for src, dst in self._CHOSEN_MAPPINGS:
+            v = chosen.get(src)
+            if v:
+                rec[dst] = v
 
     def _parse_all_onts_filter(self, raw: str) -> List[Dict[str, Any]]:
         """
@@ -662,74 +1184,30 @@ class APIOLT1240XA:
         - Múltiples bloques con cabecera repetida.
         - Columnas segmentadas por pipes (|).
         """
-        lines = [l.rstrip("\r") for l in raw.splitlines()]
-        by_aid: Dict[str, Dict[str, Any]] = {}
-
-        last_aid: Optional[str] = None
-        header_mode = False
-
-        for line in lines:
-            s = line.rstrip()
-            if not s.strip():
-                continue
-
-            if self.SEP_RE.match(s.strip()):
-                continue
-
-            if s.strip().startswith("slot ") and " has " in s and " ont" in s:
-                header_mode = False
-                last_aid = None
-                continue
-
-            if "AID" in s and "Vendor/Model" in s:
-                header_mode = True
-                last_aid = None
-                continue
-
-            if not header_mode:
-                continue
-
-            if "|" not in s:
-                continue
-
-            parsed = self._parse_remote_ont_filter_row(s, last_aid=last_aid)
-            if not parsed:
-                continue
-
-            aid = parsed["AID"]
-            last_aid = aid
+        return self._parse_all_onts_stream((raw,))
 
-            row_type = parsed.get("_row_type")
-            row_payload = parsed.get("_row_payload", {})
-
-            rec = by_aid.setdefault(aid, {"AID": aid})
-            rec.setdefault("_rows", {})
-            if row_type and row_payload:
-                rec["_rows"][row_type] = row_payload
-
-            chosen = rec["_rows"].get("Actual") or rec["_rows"].get("Config") or {}
-            self._apply_chosen_row_to_record(rec, chosen)
-
-        out: List[Dict[str, Any]] = []
-        for _, rec in by_aid.items():
-            rec.pop("_rows", None)
-            out.append(rec)
-
-        out.sort(key=lambda x: x.get("AID", ""))
-        return out
+    def _parse_all_onts_stream(self, chunks: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Igual que _parse_all_onts_filter, consumiendo bloques de líneas completas
+        (p.ej. los de _send_command_stream) a medida que llegan.
+        """
+        parser = _FilterRowParser(self)
+        for text in chunks:
+            parser.feed(text)
+        return parser.result()
 
     def _parse_config_1240xa(self, aid: str, raw: str) -> Dict[str, Any]:
-        lines = [l.rstrip("\r") for l in raw.splitlines() if l.strip()]
         result: Dict[str, Any] = {"aid": aid, "ont": {}, "uni": {}}
 
         current_block: Optional[str] = None
         current_uni: Optional[str] = None
 
-        for line in lines:
+        is_sep = self._is_sep_line
+        for line in raw.splitlines():
             s = line.strip()
             if not s:
                 continue
-            if self.SEP_RE.match(s):
+            if is_sep(s):
                 continue
             if s.startswith("AID") and "Details" in s:
                 continue
@@ -771,9 +1249,18 @@ class APIOLT1240XA:
         if not s:
             return
 
-        chunks = [c.strip() for c in s.split("|") if c.strip()]
-        for chunk in chunks:
-            self._parse_config_chunk_into(target, chunk)
+        for chunk in s.split("|"):
+            chunk = chunk.strip()
+            if chunk:
+                self._parse_config_chunk_into(target, chunk)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _config_key(token: str) -> str:
+        """
+        "usbwprofname" / "anti-mac-spoofing" -> clave dict. El conjunto de claves es pequeño: se cachea.
+        """
+        return token.replace("-", "_").lower()
 
     def _parse_config_chunk_into(self, target: Dict[str, Any], s: str) -> None:
         tokens = s.split()
@@ -781,42 +1268,14 @@ class APIOLT1240XA:
             return
 
         if len(tokens) >= 2 and tokens[0] == "no":
-            key = tokens[1].replace("-", "_").lower()
+            key = self._config_key(tokens[1])
             target[key] = False
             return
 
-        key0 = tokens[0].replace("-", "_").lower()
-
-        if key0 == "queue" and len(tokens) >= 4 and tokens[1] == "tc":
-            entry: Dict[str, Any] = {"tc": int(tokens[2]) if tokens[2].isdigit() else tokens[2]}
-            i = 3
-            while i < len(tokens) - 1:
-                k = tokens[i].replace("-", "_").lower()
-                v = tokens[i + 1]
-                entry[k] = int(v) if v.isdigit() else v
-                i += 2
-            target.setdefault("queues", []).append(entry)
-            return
+        key0 = self._config_key(tokens[0])
 
-        if key0 == "bwgroup":
-            target["bwgroup"] = tokens[1] if len(tokens) > 1 else ""
-            i = 2
-            while i < len(tokens) - 1:
-                k = tokens[i].replace("-", "_").lower()
-                v = tokens[i + 1]
-                target[k] = v
-                i += 2
-            return
-
-        if key0 == "vlan":
-            entry: Dict[str, Any] = {"vlan": tokens[1] if len(tokens) > 1 else ""}
-            i = 2
-            while i < len(tokens) - 1:
-                k = tokens[i].replace("-", "_").lower()
-                v = tokens[i + 1]
-                entry[k] = v
-                i += 2
-            target.setdefault("vlans", []).append(entry)
+        handler = self._CHUNK_DISPATCH.get(key0)
+        if handler is not None and handler(self, target, tokens):
             return
 
         if len(tokens) == 2:
@@ -825,11 +1284,52 @@ class APIOLT1240XA:
 
         target.setdefault("lines", []).append(s)
 
+    def _kv_pairs_into(self, dst: Dict[str, Any], tokens: List[str], start: int, *, cast_int: bool = False) -> None:
+        """
+        Pares "clave valor" desde tokens[start:] (stride 2, un token final suelto se ignora).
+        """
+        ck = self._config_key
+        pairs = zip(tokens[start::2], tokens[start + 1::2])
+        if cast_int:
+            dst.update({ck(k): (int(v) if v.isdigit() else v) for k, v in pairs})
+        else:
+            dst.update({ck(k): v for k, v in pairs})
+
+    # Handlers por primera palabra del chunk; devuelven False para caer al caso genérico.
+    def _chunk_queue(self, target: Dict[str, Any], tokens: List[str]) -> bool:
+        if len(tokens) < 4 or tokens[1] != "tc":
+            return False
+        entry: Dict[str, Any] = {"tc": int(tokens[2]) if tokens[2].isdigit() else tokens[2]}
+        self._kv_pairs_into(entry, tokens, 3, cast_int=True)
+        target.setdefault("queues", []).append(entry)
+        return True
+
+    def _chunk_bwgroup(self, target: Dict[str, Any], tokens: List[str]) -> bool:
+        target["bwgroup"] = tokens[1] if len(tokens) > 1 else ""
+        self._kv_pairs_into(target, tokens, 2)
+        return True
+
+    def _chunk_vlan(self, target: Dict[str, Any], tokens: List[str]) -> bool:
+        entry: Dict[str, Any] = {"vlan": tokens[1] if len(tokens) > 1 else ""}
+        self._kv_pairs_into(entry, tokens, 2)
+        target.setdefault("vlans", []).append(entry)
+        return True
+
+    # clave normalizada -> handler (funciones sin ligar; se llaman con self explícito)
+    _CHUNK_DISPATCH = {
+        "queue": _chunk_queue,
+        "bwgroup": _chunk_bwgroup,
+        "vlan": _chunk_vlan,
+    }
+
     # -----------------------------
     # Utilidades
     # -----------------------------
+    def clear_ddmi_cache(self) -> None:
+        self._ddmi_cache.clear()
+
     def to_json(self, data: Any) -> str:
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _to_json(data, ensure_ascii=False)
 
     def close(self) -> None:
         self._d("close: closing telnet session...")
@@ -841,6 +1341,12 @@ class APIOLT1240XA:
             self.tn.close()
         except Exception:
             pass
+        fp, self._raw_fp = self._raw_fp, None
+        if fp is not None:
+            try:
+                fp.close()
+            except Exception:
+                pass
 
 
 if __name__ == "__main__":
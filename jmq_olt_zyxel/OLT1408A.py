@@ -1,22 +1,29 @@
-import telnetlib
 import re
-import json
-from typing import List, Dict, Any
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+from ._rawtelnet import RawTelnet
+from ._jsonutil import to_json as _to_json
 
 
 class APIOLT1408A:
     """
     Cliente API para interactuar con una OLT Zyxel 1408A vía Telnet.
     """
+
     def __init__(self, host: str, port: int, username: str, password: str,
-                 prompt: str = 'OLT1408A#', timeout: int = 5):
+                 prompt: str = 'OLT1408A#', timeout: int = 5, debug: bool = False):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.prompt = prompt.encode('ascii')
         self.timeout = timeout
-        self.tn = telnetlib.Telnet()
+        self.debug = debug
+        self.tn = RawTelnet()
         self._open_session()
 
     def _open_session(self):
@@ -26,17 +33,31 @@ class APIOLT1408A:
         self.tn.read_until(b'Password:', timeout=self.timeout)
         self.tn.write(self.password.encode('ascii') + b'\n')
         self.tn.read_until(self.prompt, timeout=self.timeout)
-        print("[DEBUG] Sesión iniciada correctamente.")
+        self._d("Sesión iniciada correctamente.")
+
+    def _d(self, msg: str) -> None:
+        if self.debug:
+            print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] [DEBUG] {msg}")
 
     def _send_command(self, command: str) -> str:
         self.tn.write(command.encode('ascii') + b'\n')
-        output = self.tn.read_until(self.prompt, timeout=self.timeout).decode('ascii', errors='ignore')
-        lines = output.splitlines()
-        if lines and lines[0].strip() == command:
-            lines.pop(0)
-        if lines and lines[-1].strip().endswith(self.prompt.decode('ascii')):
-            lines.pop()
-        return "\n".join(lines)
+        raw = self.tn.read_until(self.prompt, timeout=self.timeout)
+        # una sola decodificación + saltos de línea normalizados a \n (como en OLT2406/1240XA);
+        # luego fuera el eco del comando (primera línea) y el prompt (última línea)
+        text = self._decode_lines(raw)
+        if text.endswith("\n"):
+            text = text[:-1]
+        first, _, rest = text.partition("\n")
+        if first.strip() == command:
+            text = rest
+        head, _, last = text.rpartition("\n")
+        if last.strip().endswith(self.prompt.decode('ascii')):
+            text = head
+        return text
+
+    @staticmethod
+    def _decode_lines(raw: bytes) -> str:
+        return raw.decode('ascii', 'ignore').replace("\r\n", "\n").replace("\r", "\n")
 
     def get_all_onts(self) -> List[Dict[str, Any]]:
         raw = self._send_command("show remote ont")
@@ -62,14 +83,17 @@ class APIOLT1408A:
 
     def get_ont_status_history(self, aid: str) -> List[Dict[str, str]]:
         raw = self._send_command(f"show remote ont {aid} status-history")
-        lines = raw.splitlines()
         history: List[Dict[str, str]] = []
-        seps = [i for i,l in enumerate(lines) if re.match(r'^\s*-+\+-+', l)]
-        if len(seps) < 2:
+        # sin separador "-+-" no hay tabla (historial vacío): no hace falta partir líneas
+        if "-+-" not in raw:
+            return history
+        lines = raw.splitlines()
+        _, start = self._find_table_bounds(lines)
+        if start is None:
             return history
-        start = seps[1] + 1
+        is_sep = self._is_sep_line
         for line in lines[start:]:
-            if re.match(r'^\s*-+\+-+', line):
+            if is_sep(line):
                 break
             cleaned = line.lstrip(' |').strip()
             if not cleaned:
@@ -89,8 +113,9 @@ class APIOLT1408A:
         lines = raw.splitlines()
         result: Dict[str, Any] = {"ont": {}, "uni": {}}
         block = None
+        is_sep = self._is_sep_line
         for line in lines:
-            if re.match(r'^\s*-+\+-+', line):
+            if is_sep(line):
                 continue
             stripped = line.strip()
             if stripped.startswith(aid):
@@ -144,14 +169,38 @@ class APIOLT1408A:
                     result['uni']['aesencrypt'] = tokens[1]
         return result
 
+    @staticmethod
+    def _is_sep_line(line: str) -> bool:
+        """
+        Separador de tabla "-----+-----" (admite espacios delante). Equivale, sin regex, a
+        re.match(r'^\s*-+\+-+', line).
+        """
+        t = line.lstrip()
+        return t.startswith("-") and t.lstrip("-").startswith("+-")
+
+    def _find_table_bounds(self, lines: List[str]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        (línea de cabecera, primera línea de datos): tras el 1er y el 2º separador.
+        Se para en el 2º separador en lugar de recorrer toda la salida.
+        """
+        header_idx: Optional[int] = None
+        is_sep = self._is_sep_line
+        for i, l in enumerate(lines):
+            if is_sep(l):
+                if header_idx is None:
+                    header_idx = i + 1
+                else:
+                    return header_idx, i + 1
+        return header_idx, None
+
     def _parse_table(self, raw: str, key_prefix: str = "ont-") -> List[Dict[str, Any]]:
+        if "-+-" not in raw:
+            return []
         lines = raw.splitlines()
-        seps = [i for i,l in enumerate(lines) if re.match(r'^\s*-+\+-+', l)]
-        if len(seps) < 2:
+        header_idx, data_start = self._find_table_bounds(lines)
+        if data_start is None:
             return []
-        header_idx = seps[0] + 1
         headers = [h.strip() for h in lines[header_idx].split('|')]
-        data_start = seps[1] + 1
         data: List[Dict[str, Any]] = []
         for line in lines[data_start:]:
             if not line.strip() or line.strip().startswith('Total:'):
@@ -165,8 +214,43 @@ class APIOLT1408A:
             data.append(dict(zip(headers, cols)))
         return data
 
+    @classmethod
+    def get_details_bulk(cls, host: str, port: int, username: str, password: str, aids: List[str],
+                         prompt: str = 'OLT1408A#', timeout: int = 5, concurrency: int = 4,
+                         pool: Optional["ConnectionPool"] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        get_ont_details de muchos AIDs en paralelo sobre `concurrency` sesiones del pool.
+        Sin `pool` se usa uno propio de esta llamada y sus sesiones se cierran al terminar;
+        con `pool` las sesiones quedan en él para reutilizarlas (el llamante hace close_all()).
+        Devuelve {aid: details}; un AID que falla queda con {}.
+        """
+        own_pool = pool is None
+        if pool is None:
+            pool = ConnectionPool()
+
+        def fetch(aid: str) -> Dict[str, Any]:
+            try:
+                api = pool.acquire(host, port, username, password, prompt=prompt, timeout=timeout)
+            except Exception:
+                # login/timeout al abrir la sesión: solo falla este AID
+                return {}
+            try:
+                details = api.get_ont_details(aid)
+            except Exception:
+                pool.discard(api)
+                return {}
+            pool.release(api)
+            return details
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(aids)))) as ex:
+                return dict(zip(aids, ex.map(fetch, aids)))
+        finally:
+            if own_pool:
+                pool.close_all()
+
     def to_json(self, data: Any) -> str:
-        return json.dumps(data, indent=2)
+        return _to_json(data)
 
     def close(self) -> None:
         try:
@@ -174,3 +258,87 @@ class APIOLT1408A:
         except Exception:
             pass
         self.tn.close()
+
+
+class ConnectionPool:
+    """
+    Pool de sesiones APIOLT1408A persistentes por (host, port, username, password, prompt, timeout);
+    la contraseña entra en la clave como hash: una sesión solo se reutiliza con las mismas credenciales.
+    La caducidad se aplica al adquirir/devolver (sin hilo de mantenimiento): se cierran
+    las sesiones inactivas más de idle_timeout o con más de max_age segundos de vida.
+    hits/misses cuentan reutilizaciones frente a logins nuevos.
+    """
+
+    def __init__(self, idle_timeout: float = 60.0, max_age: float = 600.0, max_idle: int = 4):
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.max_idle = max_idle
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # clave -> [(api, creada, último uso)]
+        self._idle: Dict[Tuple[Any, ...], List[Tuple[APIOLT1408A, float, float]]] = {}
+        # id(api) -> (clave, creada) de las sesiones prestadas
+        self._out: Dict[int, Tuple[Tuple[Any, ...], float]] = {}
+
+    def _expired(self, created: float, last_used: float, now: float) -> bool:
+        return now - last_used > self.idle_timeout or now - created > self.max_age
+
+    def acquire(self, host: str, port: int, username: str, password: str,
+                prompt: str = 'OLT1408A#', timeout: int = 5) -> APIOLT1408A:
+        pw_hash = hashlib.sha256(password.encode("utf-8")).hexdigest()
+        key = (host, port, username, pw_hash, prompt, timeout)
+        stale: List[APIOLT1408A] = []
+        api: Optional[APIOLT1408A] = None
+        now = time.monotonic()
+        with self._lock:
+            entries = self._idle.get(key, [])
+            while entries:
+                cand, created, last_used = entries.pop()
+                if self._expired(created, last_used, now):
+                    stale.append(cand)
+                    continue
+                api = cand
+                self.hits += 1
+                self._out[id(api)] = (key, created)
+                break
+        for old in stale:
+            old.close()
+        if api is not None:
+            return api
+
+        api = APIOLT1408A(host, port, username, password, prompt=prompt, timeout=timeout)
+        with self._lock:
+            self.misses += 1
+            self._out[id(api)] = (key, time.monotonic())
+        return api
+
+    def release(self, api: APIOLT1408A) -> None:
+        now = time.monotonic()
+        with self._lock:
+            key, created = self._out.pop(id(api))
+            entries = self._idle.setdefault(key, [])
+            keep = not self._expired(created, now, now) and len(entries) < self.max_idle
+            if keep:
+                entries.append((api, created, now))
+        if not keep:
+            api.close()
+
+    def discard(self, api: APIOLT1408A) -> None:
+        # sesión en estado dudoso (error a mitad de comando): no vuelve al pool
+        with self._lock:
+            self._out.pop(id(api), None)
+        try:
+            api.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle = [api for entries in self._idle.values() for api, _, _ in entries]
+            self._idle.clear()
+        for api in idle:
+            try:
+                api.close()
+            except Exception:
+                pass
@@ -17,21 +17,44 @@ Reparaciones incluidas (basadas en tus logs reales):
   - En consola se filtran secuencias ANSI para que el terminal no “meta” respuestas como ^[[25;1R.
 
 Mantiene la misma API pública:
-- get_all_onts, get_unregistered_onts, get_ont_details, get_ont_status_history, get_ont_config, to_json, close
+- get_all_onts, get_unregistered_onts, get_ont_details, get_ont_status_history, get_ont_config,
+  get_ont_full, get_ont_details_bulk, send_commands, clear_config_cache, to_json, close
+- AsyncAPIOLT2406: mismos métodos como corrutinas (asyncio), para consultar muchas OLTs a la vez.
 
 Ajustes solicitados:
 - get_ont_details(aid) devuelve salida PLANA (Dict[str, Any]) tipo OLT1408A.
 - get_unregistered_onts() parsea correctamente el formato real:
     Pon_AID | Type SN Password Status
     pon-x-y | UnReg <SN> DEFAULT Active
+
+Transporte:
+- Usa RawTelnet (socket + recv en bloque, IAC procesado por tramos) en lugar de telnetlib,
+  que procesa la entrada byte a byte en Python.
 """
 
-import telnetlib
 import re
-import json
 import time
+import select
 import sys
-from typing import List, Dict, Any, Optional
+import asyncio
+import copy
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, BinaryIO, Callable
+
+from ._rawtelnet import RawTelnet
+from ._jsonutil import to_json as _to_json
+
+# whitespace ASCII (mismo conjunto que bytes.strip() y \s en patrones bytes)
+_WS_BYTES = b" \t\n\r\x0b\x0c"
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_prompt_end_re(prompt_bytes: bytes) -> "re.Pattern[bytes]":
+    """
+    Regex "prompt al final" compilada una vez por prompt (compartida entre instancias).
+    """
+    return re.compile(re.escape(prompt_bytes) + rb"\s*$")
 
 
 class APIOLT2406:
@@ -43,16 +66,16 @@ class APIOLT2406:
     AID_RE = re.compile(r"^ont-\d+(?:-\d+){2,}$")   # ont-x-y-z...
     PON_AID_RE = re.compile(r"^pon-\d+(?:-\d+){1,}$")
 
-    # Separadores: "-----+-----" o "------------+------"
-    SEP_RE = re.compile(r"^\s*-+\s*\+\s*-+.*$")
-
     # ANSI / VT100 (para filtrar en consola y evitar efectos colaterales del terminal)
     ANSI_RE = re.compile(rb"\x1b\[[0-9;?]*[A-Za-z]")
 
+    # _drain_input: segundos sin datos tras los que se da la entrada por vacía
+    DRAIN_QUIET = 0.05
+
     # Fila UNREG real:
     #   UnReg 5A59495397426460 DEFAULT Active
     _UNREG_ROW_RE = re.compile(
-        r"^(?P<type>\S+)\s+(?P<sn>[0-9A-Fa-f]{8,32})\s+(?P<password>\S+)\s+(?P<status>\S+)\s*$"
+        r"^\s*(?P<type>\S+)\s+(?P<sn>[0-9A-Fa-f]{8,32})\s+(?P<password>\S+)\s+(?P<status>\S+)\s*$"
     )
 
     def __init__(
@@ -69,6 +92,7 @@ class APIOLT2406:
         debug_telnet_dump: bool = False,
         debug_telnet_raw_file: Optional[str] = "/tmp/olt2406_telnet_raw.log",
         eol: bytes = b"\r\n",
+        config_cache_ttl: float = 0.0,  # segundos; 0 (por defecto) desactiva la caché de get_ont_config
     ):
         self.host = host
         self.port = port
@@ -83,12 +107,33 @@ class APIOLT2406:
         self.debug_telnet_dump = debug_telnet_dump
         self.debug_telnet_raw_file = debug_telnet_raw_file
         self.eol = eol
+        self.config_cache_ttl = config_cache_ttl
+
+        # {aid: (monotonic de la lectura, config parseada)} para get_ont_config
+        self._config_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+        # Sin debug, _d/_dump_telnet no hacen nada: se sustituyen en la instancia por no-ops
+        # (ahorra la llamada + comprobación en cada lectura). "debug" se fija al construir.
+        if not self.debug:
+            self._d = lambda msg: None
+        if not self.debug or not (self.debug_telnet_dump or self.debug_telnet_raw_file):
+            # debug solo con trazas _d(): tampoco hay volcado que hacer
+            self._dump_telnet = lambda context, raw: None
+
+        # Prompt detection robusto (bytes del prompt codificados una sola vez):
+        self._prompt_bytes = self.prompt.encode("ascii")
+        self._prompt_end_re = _compile_prompt_end_re(self._prompt_bytes)
+
+        self.tn = RawTelnet()
 
-        # Prompt detection robusto:
-        self._prompt_end_re = re.compile(re.escape(self.prompt).encode("ascii") + rb"\s*$")
-        self._prompt_only_re = re.compile(rb"^\s*" + re.escape(self.prompt).encode("ascii") + rb"\s*$")
+        # True cuando la última lectura terminó limpiamente en prompt (permite saltar el resync)
+        self._last_prompt_clean = False
 
-        self.tn = telnetlib.Telnet()
+        # prefijo de ESC[6n pendiente al final del último chunk (ver _ansi_autoreply)
+        self._ansi_carry = b""
+
+        # fichero RAW de debug (debug_telnet_raw_file), abierto en el primer volcado
+        self._raw_fp: Optional[BinaryIO] = None
 
         self._d(
             "Init APIOLT2406 "
@@ -96,7 +141,7 @@ class APIOLT2406:
             f"prompt={self.prompt!r}, debug={self.debug}, "
             f"debug_telnet_dump={self.debug_telnet_dump}, "
             f"debug_telnet_raw_file={self.debug_telnet_raw_file!r}, "
-            f"eol={self.eol!r})"
+            f"eol={self.eol!r}, config_cache_ttl={self.config_cache_ttl})"
         )
 
         self._open_session()
@@ -112,6 +157,9 @@ class APIOLT2406:
             print(f"[{self._ts()}] [DEBUG] {msg}")
 
     def _strip_ansi(self, raw: bytes) -> bytes:
+        # Caso común: salida CLI limpia, sin ESC -> no pasar por el motor regex
+        if b"\x1b" not in raw:
+            return raw
         return self.ANSI_RE.sub(b"", raw)
 
     def _dump_telnet(self, context: str, raw: bytes) -> None:
@@ -120,10 +168,12 @@ class APIOLT2406:
 
         if self.debug_telnet_raw_file:
             try:
-                with open(self.debug_telnet_raw_file, "ab") as f:
-                    header = f"\n\n===== {self._ts()} {context} =====\n".encode("utf-8", errors="ignore")
-                    f.write(header)
-                    f.write(raw)
+                if self._raw_fp is None:
+                    # se abre una sola vez por sesión (escritura con buffer); se vuelca en close()
+                    self._raw_fp = open(self.debug_telnet_raw_file, "ab", buffering=64 * 1024)
+                header = f"\n\n===== {self._ts()} {context} =====\n".encode("utf-8", errors="ignore")
+                self._raw_fp.write(header)
+                self._raw_fp.write(raw)
             except Exception as e:
                 self._d(f"_dump_telnet: error escribiendo RAW a fichero => {e!r}")
 
@@ -131,11 +181,8 @@ class APIOLT2406:
             return
 
         # print(f"[{self._ts()}] [TELNET] --- {context} START ---")
-        try:
-            safe = self._strip_ansi(raw)
-            txt = safe.decode("latin-1", errors="strict")
-        except Exception:
-            txt = raw.decode("utf-8", errors="replace")
+        # solo se filtra ANSI cuando realmente se va a imprimir; latin-1 decodifica cualquier byte
+        txt = self._strip_ansi(raw).decode("latin-1")
 
         sys.stdout.write(txt)
         sys.stdout.flush()
@@ -148,12 +195,23 @@ class APIOLT2406:
     # ANSI/VT100 autoresponse
     # -----------------------------
     def _ansi_autoreply(self, data: bytes) -> None:
+        if self._ansi_carry:
+            # ESC[6n partido entre dos chunks: se completa con el principio del siguiente
+            data = self._ansi_carry + data
+            self._ansi_carry = b""
+        if b"\x1b" not in data:
+            return
         if b"\x1b[6n" in data:
             self._d("ANSI query detectada: ESC[6n. Respondiendo ESC[1;1R por telnet.")
             try:
                 self.tn.write(b"\x1b[1;1R")
             except Exception as e:
                 self._d(f"Error enviando respuesta ANSI => {e!r}")
+        # consulta incompleta al final del chunk: se guarda para el siguiente (solo se miran 3 bytes)
+        for n in (3, 2, 1):
+            if data.endswith(b"\x1b[6n"[:n]):
+                self._ansi_carry = data[-n:]
+                break
 
     # -----------------------------
     # Sesión / IO
@@ -161,6 +219,9 @@ class APIOLT2406:
     def _open_session(self) -> None:
         self._d("Abriendo sesión Telnet...")
         self.tn.open(self.host, self.port, timeout=self.timeout)
+        if self.debug:
+            # valores leídos del socket: _tune_socket es best-effort y el SO puede ignorarlos
+            self._d(f"Socket abierto: {self.tn.socket_options()}")
 
         self._d("Esperando prompt de usuario...")
         _ = self.tn.read_until(self.login_user_prompt, timeout=self.timeout)
@@ -183,30 +244,77 @@ class APIOLT2406:
 
         self._d("Sesión iniciada (si hay prompt visible en dumps).")
 
+    def _wait_readable(self, timeout: float) -> bool:
+        """
+        Bloquea hasta que el socket telnet tenga datos o venza timeout (en lugar de time.sleep fijo).
+        Devuelve False solo si select confirma que no llegó nada.
+        """
+        if timeout <= 0:
+            return False
+        try:
+            return bool(select.select([self.tn.get_socket()], [], [], timeout)[0])
+        except (OSError, ValueError):
+            # socket cerrado / no disponible: mantener el comportamiento de espera
+            time.sleep(timeout)
+            return True
+
     def _drain_input(self, drain_for: float = 0.25) -> bytes:
-        self._d(f"_drain_input(drain_for={drain_for}) => start")
-        end = time.time() + drain_for
-        buf = b""
-        while time.time() < end:
-            chunk = self.tn.read_very_eager()
+        """
+        Descarta/recoge bytes pendientes durante como mucho drain_for (se alarga si siguen
+        llegando datos); termina antes si la línea queda en silencio DRAIN_QUIET segundos.
+        """
+        if self.debug:
+            self._d(f"_drain_input(drain_for={drain_for}) => start")
+        end = time.monotonic() + drain_for
+        buf = bytearray()
+        read = self.tn.read_very_eager
+        autoreply = self._ansi_autoreply
+        while time.monotonic() < end:
+            chunk = read()
             if chunk:
-                self._ansi_autoreply(chunk)
+                autoreply(chunk)
                 buf += chunk
-                end = max(end, time.time() + 0.05)
-            else:
-                time.sleep(0.02)
-        self._d(f"_drain_input => drained bytes={len(buf)}")
-        if buf:
-            self._dump_telnet("DRAIN", buf)
-        return buf
+                end = max(end, time.monotonic() + 0.05)
+            elif not self._wait_readable(min(self.DRAIN_QUIET, end - time.monotonic())):
+                # línea en silencio DRAIN_QUIET segundos: no hace falta agotar drain_for
+                break
+        if self.debug:
+            self._d(f"_drain_input => drained bytes={len(buf)}")
+        out = bytes(buf)
+        if out:
+            self._dump_telnet("DRAIN", out)
+        return out
 
     def _has_real_progress(self, buf: bytes) -> bool:
-        tmp = buf.strip(b"\r\n\t ")
-        if not tmp:
+        # progreso real = algo distinto de whitespace y/o el prompt solo.
+        # Equivale a buf.strip() not in (b"", prompt) sin copiar el buffer: se recorre el
+        # whitespace de ambos extremos y solo se compara si la longitud coincide con el prompt.
+        n = len(buf)
+        lo = 0
+        while lo < n and buf[lo] in _WS_BYTES:
+            lo += 1
+        hi = n
+        while hi > lo and buf[hi - 1] in _WS_BYTES:
+            hi -= 1
+        if hi == lo:
             return False
-        if self._prompt_only_re.match(tmp):
-            return False
-        return True
+        prompt = self._prompt_bytes
+        return hi - lo != len(prompt) or buf[lo:hi] != prompt
+
+    def _prompt_start(self, raw: bytes) -> int:
+        """
+        Posición del prompt final de raw (admite whitespace detrás) o -1.
+        Equivale a _prompt_end_re.search(raw.rstrip(b"\r\n")) pero sin regex ni copia del buffer.
+        """
+        prompt = self._prompt_bytes
+        if not prompt or prompt[-1:].isspace():
+            # prompt terminado en whitespace: el recorte manual sería ambiguo, se usa la regex
+            m = self._prompt_end_re.search(raw.rstrip(b"\r\n"))
+            return m.start() if m else -1
+        end = len(raw)
+        while end and raw[end - 1] in _WS_BYTES:
+            end -= 1
+        return end - len(prompt) if raw.endswith(prompt, 0, end) else -1
 
     def _read_until_prompt(
         self,
@@ -218,39 +326,52 @@ class APIOLT2406:
         if timeout is None:
             timeout = self.timeout
 
-        end_time = time.time() + timeout
-        buf = b""
+        end_time = time.monotonic() + timeout
+        # bytearray: extend in-place (evita el O(N^2) de bytes += chunk en salidas largas)
+        buf = bytearray()
+        # el prompt solo puede estar al final: basta con mirar la cola del buffer
+        tail_len = len(self.prompt) + 64
         saw_progress = not require_progress
+        prompt = self._prompt_bytes
 
-        self._d(f"_read_until_prompt(timeout={timeout}, require_progress={require_progress}, context={context}) => start")
+        if self.debug:
+            self._d(f"_read_until_prompt(timeout={timeout}, require_progress={require_progress}, context={context}) => start")
 
         last_stat = 0.0
-        while time.time() < end_time:
-            chunk = self.tn.read_very_eager()
+        read = self.tn.read_very_eager
+        autoreply = self._ansi_autoreply
+        while time.monotonic() < end_time:
+            chunk = read()
             if chunk:
-                self._ansi_autoreply(chunk)
+                autoreply(chunk)
                 buf += chunk
 
                 if not saw_progress and self._has_real_progress(buf):
                     saw_progress = True
 
-                now = time.time()
-                if self.debug and (now - last_stat) >= 0.8:
-                    last_stat = now
-                    self._d(f"_read_until_prompt: bytes={len(buf)} saw_progress={saw_progress}")
+                if self.debug:
+                    now = time.monotonic()
+                    if (now - last_stat) >= 0.8:
+                        last_stat = now
+                        self._d(f"_read_until_prompt: bytes={len(buf)} saw_progress={saw_progress}")
 
-                if self._prompt_end_re.search(buf.rstrip(b"\r\n")):
+                # prompt al final del buffer (ignorando whitespace) sin pasar por regex
+                if buf[-tail_len:].rstrip().endswith(prompt):
                     if require_progress and not saw_progress:
                         continue
                     self._d("_read_until_prompt: prompt detectado al final del buffer.")
-                    return buf
+                    self._last_prompt_clean = True
+                    return bytes(buf)
             else:
-                time.sleep(0.05)
+                # sin datos: bloquear en el socket hasta que lleguen bytes o venza el timeout
+                self._wait_readable(end_time - time.monotonic())
 
         self._d(f"_read_until_prompt: TIMEOUT (bytes={len(buf)})")
-        if buf:
-            self._dump_telnet(f"{context}-TIMEOUT-BUF", buf)
-        return buf
+        self._last_prompt_clean = False
+        out = bytes(buf)
+        if out:
+            self._dump_telnet(f"{context}-TIMEOUT-BUF", out)
+        return out
 
     def _resync_cli(self) -> None:
         self._d("_resync_cli: enviando EOL para resincronizar...")
@@ -259,37 +380,213 @@ class APIOLT2406:
         self._dump_telnet("RESYNC", buf)
         _ = self._drain_input(drain_for=0.15)
 
-    def _send_command(self, command: str) -> str:
-        self._d(f"_send_command: preparando comando={command!r}")
-
-        self._resync_cli()
-        _ = self._drain_input(drain_for=0.2)
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _encode_command(command: str, eol: bytes) -> bytes:
+        """
+        Bytes de comando + EOL listos para enviar (cacheado: los mismos comandos se repiten por sesión/AID).
+        """
+        return command.encode("ascii") + eol
+
+    def _ensure_clean_prompt(self) -> None:
+        # comando encadenado tras un prompt limpio y sin bytes pendientes: se salta el resync
+        clean = self._last_prompt_clean and not self._drain_input(drain_for=0.02)
+        if not clean:
+            self._resync_cli()
+            _ = self._drain_input(drain_for=0.2)
+        # se invalida hasta que este comando vuelva a leer un prompt (también ante excepciones)
+        self._last_prompt_clean = False
+
+    def _begin_command(self, command: str) -> None:
+        """
+        Resync (si hace falta) + envío del comando; común a _send_command y _send_command_stream.
+        """
+        if self.debug:
+            self._d(f"_send_command: preparando comando={command!r}")
+        self._ensure_clean_prompt()
+        if self.debug:
+            self._d(f"CMD => {command}")
+        self.tn.write(self._encode_command(command, self.eol))
 
-        self._d(f"CMD => {command}")
-        self.tn.write(command.encode("ascii") + self.eol)
+    def _send_command(self, command: str) -> str:
+        self._begin_command(command)
 
         raw = self._read_until_prompt(timeout=self.timeout, require_progress=True, context=f"CMD:{command}")
         self._dump_telnet(f"CMD OUTPUT: {command}", raw)
 
-        m = self._prompt_end_re.search(raw.rstrip(b"\r\n"))
-        raw_wo_prompt = raw[: m.start()] if m else raw
+        k = self._prompt_start(raw)
+        # secuencias ANSI fuera una sola vez aquí: los parsers reciben texto limpio
+        raw_wo_prompt = self._strip_ansi(raw[:k] if k >= 0 else raw)
+
+        # Una sola decodificación + normalización de saltos de línea
+        return self._strip_echo(self._decode_lines(raw_wo_prompt), command)[0]
+
+    @staticmethod
+    def _strip_echo(out: str, command: str) -> Tuple[str, bool]:
+        """
+        Quita vacíos iniciales y el eco del comando mirando solo el principio (sin
+        splitlines/join de toda la salida). Devuelve (texto, si había eco).
+        """
+        n = len(out)
+        pos = 0
+        echoed = False
+        while pos < n:
+            nl = out.find("\n", pos)
+            end = n if nl < 0 else nl
+            first = out[pos:end].strip()
+            if first:
+                if first == command.strip():
+                    pos = end + 1
+                    echoed = True
+                break
+            pos = end + 1
+
+        return out[pos:].strip("\n"), echoed
+
+    def send_commands(self, commands: List[str]) -> List[str]:
+        """
+        Ejecuta varios comandos con un único write (pipelining: 1 RTT en lugar de N) y
+        reparte la salida por prompts. Devuelve una salida por comando, igual que _send_command.
+        Si la salida no cuadra (menos prompts o un eco que no corresponde), se repite
+        comando a comando.
+        """
+        if len(commands) < 2:
+            return [self._send_command(c) for c in commands]
+
+        self._ensure_clean_prompt()
+        self._d(f"CMDS => {commands!r}")
+        self.tn.write(b"".join(self._encode_command(c, self.eol) for c in commands))
+
+        raw = self._read_until_prompts(len(commands), timeout=self.timeout * len(commands))
+        self._dump_telnet(f"CMDS OUTPUT: {commands!r}", raw)
+
+        parts = self._strip_ansi(raw).split(self._prompt_bytes)
+        outs: List[str] = []
+        if len(parts) > len(commands):
+            for command, part in zip(commands, parts):
+                out, echoed = self._strip_echo(self._decode_lines(part), command)
+                if not echoed:
+                    break
+                outs.append(out)
+
+        if len(outs) == len(commands):
+            return outs
+
+        self._d("send_commands: salida desalineada; se repite comando a comando")
+        self._last_prompt_clean = False
+        return [self._send_command(c) for c in commands]
+
+    def _read_until_prompts(self, count: int, *, timeout: float) -> bytes:
+        """
+        Como _read_until_prompt, pero espera `count` prompts (uno por comando encadenado),
+        el último al final del buffer.
+        """
+        end_time = time.monotonic() + timeout
+        buf = bytearray()
+        tail_len = len(self.prompt) + 64
+        prompt = self._prompt_bytes
+        seen = 0
+        search_from = 0
+
+        read = self.tn.read_very_eager
+        autoreply = self._ansi_autoreply
+        while time.monotonic() < end_time:
+            chunk = read()
+            if not chunk:
+                self._wait_readable(end_time - time.monotonic())
+                continue
+
+            autoreply(chunk)
+            buf += chunk
+
+            while True:
+                k = buf.find(prompt, search_from)
+                if k < 0:
+                    break
+                seen += 1
+                search_from = k + len(prompt)
+            # un prompt puede quedar partido entre dos chunks: se vuelve a mirar la cola
+            search_from = max(search_from, len(buf) - len(prompt) + 1)
+
+            if seen >= count and buf[-tail_len:].rstrip().endswith(prompt):
+                self._last_prompt_clean = True
+                return bytes(buf)
 
-        out = raw_wo_prompt.decode("latin-1", errors="ignore")
+        self._d(f"_read_until_prompts({count}): TIMEOUT (bytes={len(buf)}, prompts={seen})")
+        self._last_prompt_clean = False
+        return bytes(buf)
 
-        lines = out.splitlines()
-        while lines and not lines[0].strip():
-            lines.pop(0)
-        if lines and lines[0].strip() == command.strip():
-            lines.pop(0)
+    @staticmethod
+    def _decode_lines(raw: bytes) -> str:
+        return raw.decode("latin-1").replace("\r\n", "\n").replace("\r", "\n")
+
+    def _send_command_stream(self, command: str) -> Iterator[str]:
+        """
+        Como _send_command, pero entrega la salida por bloques de líneas completas (str con
+        saltos "\n") según llegan del socket, sin acumular la salida entera en memoria.
+        El prompt final y las secuencias ANSI no se entregan; el eco del comando sí.
+        Misma detección de fin que _read_until_prompt (cola del buffer + progreso real).
+        """
+        self._begin_command(command)
+
+        end_time = time.monotonic() + self.timeout
+        tail_len = len(self.prompt) + 64
+        tail = b""  # equivalente a buf[-tail_len:] de _read_until_prompt
+        carry = bytearray()  # línea incompleta pendiente
+        head: Optional[bytearray] = bytearray()  # solo hasta ver progreso real
+        total = 0
+
+        read = self.tn.read_very_eager
+        autoreply = self._ansi_autoreply
+        while time.monotonic() < end_time:
+            chunk = read()
+            if not chunk:
+                self._wait_readable(end_time - time.monotonic())
+                continue
+
+            autoreply(chunk)
+            if self.debug:
+                self._dump_telnet(f"CMD STREAM: {command}", chunk)
+            total += len(chunk)
+            carry += chunk
+            tail = (tail + chunk)[-tail_len:]
+
+            if head is not None:
+                head += chunk
+                if self._has_real_progress(head):
+                    head = None
+
+            if head is None and tail.rstrip().endswith(self._prompt_bytes):
+                self._last_prompt_clean = True
+                break
 
-        return "\n".join(lines).strip("\n")
+            nl = carry.rfind(b"\n")
+            if nl >= 0:
+                # una secuencia ANSI no cruza "\n": se puede limpiar por bloques de líneas
+                yield self._decode_lines(self._strip_ansi(carry[: nl + 1]))
+                del carry[: nl + 1]
+        else:
+            self._d(f"_send_command_stream({command!r}): TIMEOUT (bytes={total})")
+            self._last_prompt_clean = False
+
+        k = self._prompt_start(carry)
+        if k >= 0:
+            del carry[k:]
+        if carry:
+            yield self._decode_lines(self._strip_ansi(carry))
 
     # -----------------------------
     # API pública
     # -----------------------------
     def get_all_onts(self) -> List[Dict[str, Any]]:
-        raw = self._send_command("show remote ont")
-        return self._parse_table_any(raw, row_prefix="ont-")
+        stream = self._send_command_stream("show remote ont")
+        rows = self._parse_table_lines(
+            (line for block in stream for line in block.splitlines()), row_prefix="ont-"
+        )
+        # el parser para en "Total:": consumir el resto hasta el prompt para dejar la CLI limpia
+        for _ in stream:
+            pass
+        return rows
 
     def get_unregistered_onts(self) -> List[Dict[str, Any]]:
         raw = self._send_command("show remote ont unreg")
@@ -301,6 +598,82 @@ class APIOLT2406:
         """
         self._d(f"get_ont_details: start aid={aid!r}")
         raw = self._send_command(f"show remote ont {aid}")
+        return self._parse_ont_details(raw)
+
+    def get_ont_details_bulk(self, aids: List[str], *, batch_size: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        get_ont_details de muchos AIDs sobre esta misma sesión, encadenando `batch_size`
+        comandos por envío (send_commands): un RTT por lote en lugar de uno por AID.
+        Devuelve {aid: details} en el orden de `aids`.
+        """
+        batch_size = max(1, batch_size)
+        result: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(aids), batch_size):
+            batch = aids[i:i + batch_size]
+            raws = self.send_commands([f"show remote ont {aid}" for aid in batch])
+            for aid, raw in zip(batch, raws):
+                result[aid] = self._parse_ont_details(raw)
+        return result
+
+    def get_ont_status_history(self, aid: str) -> List[Dict[str, Any]]:
+        raw = self._send_command(f"show remote ont {aid} status-history")
+        return self._parse_status_history(raw)
+
+    def get_ont_config(self, aid: str, *, bypass_cache: bool = False) -> Dict[str, Any]:
+        """
+        Con config_cache_ttl > 0 se reutiliza la config parseada del AID durante ese tiempo
+        (bypass_cache=True fuerza la consulta). Se devuelve siempre una copia.
+        """
+        if not bypass_cache:
+            cached = self._config_cache_get(aid)
+            if cached is not None:
+                self._d(f"get_ont_config: aid={aid!r} desde caché")
+                return copy.deepcopy(cached)
+        raw = self._send_command(f"show remote ont {aid} config")
+        config = self._parse_ont_config(aid, raw)
+        self._config_cache_put(aid, config)
+        return config
+
+    def get_ont_full(self, aid: str) -> Dict[str, Any]:
+        """
+        details + status-history + config de un AID en un solo envío (send_commands).
+        Devuelve {"details": ..., "status_history": ..., "config": ...} con los mismos
+        formatos que get_ont_details / get_ont_status_history / get_ont_config.
+        """
+        raw_details, raw_hist, raw_config = self.send_commands([
+            f"show remote ont {aid}",
+            f"show remote ont {aid} status-history",
+            f"show remote ont {aid} config",
+        ])
+        config = self._parse_ont_config(aid, raw_config)
+        self._config_cache_put(aid, config)
+        return {
+            "details": self._parse_ont_details(raw_details),
+            "status_history": self._parse_status_history(raw_hist),
+            "config": config,
+        }
+
+    def clear_config_cache(self) -> None:
+        self._config_cache.clear()
+
+    def _config_cache_get(self, aid: str) -> Optional[Dict[str, Any]]:
+        if self.config_cache_ttl <= 0:
+            return None
+        entry = self._config_cache.get(aid)
+        if entry and time.monotonic() - entry[0] < self.config_cache_ttl:
+            return entry[1]
+        return None
+
+    def _config_cache_put(self, aid: str, config: Dict[str, Any]) -> None:
+        # sin bloques ont/uni suele ser timeout/salida incompleta: no se cachea.
+        # Se guarda una copia: el llamante puede modificar el dict que recibe.
+        if self.config_cache_ttl > 0 and (config.get("ont") or config.get("uni")):
+            self._config_cache[aid] = (time.monotonic(), copy.deepcopy(config))
+
+    # -----------------------------
+    # Parsing helpers
+    # -----------------------------
+    def _parse_ont_details(self, raw: str) -> Dict[str, Any]:
         lines = raw.splitlines()
 
         details: Dict[str, Any] = {}
@@ -315,20 +688,21 @@ class APIOLT2406:
             if ":" not in cleaned:
                 continue
 
-            key, val = cleaned.split(":", 1)
-            k = key.strip()
-            v = val.strip()
+            k, _, v = cleaned.partition(":")
+            k = k.strip()
             if not k:
                 continue
 
-            details[k] = v
+            details[k] = v.strip()
 
         return details
 
-    def get_ont_status_history(self, aid: str) -> List[Dict[str, Any]]:
-        raw = self._send_command(f"show remote ont {aid} status-history")
-        lines = raw.splitlines()
+    def _parse_status_history(self, raw: str) -> List[Dict[str, Any]]:
         history: List[Dict[str, Any]] = []
+        # sin "|" no hay filas posibles (p.ej. ONT recién dada de alta, historial vacío)
+        if "|" not in raw:
+            return history
+        lines = raw.splitlines()
 
         for line in lines:
             if "|" not in line:
@@ -348,8 +722,7 @@ class APIOLT2406:
 
         return history
 
-    def get_ont_config(self, aid: str) -> Dict[str, Any]:
-        raw = self._send_command(f"show remote ont {aid} config")
+    def _parse_ont_config(self, aid: str, raw: str) -> Dict[str, Any]:
         lines = raw.splitlines()
 
         # Mantener estructura "ont" y "uni" (plana por uniport)
@@ -358,12 +731,14 @@ class APIOLT2406:
         current_block: Optional[str] = None
         current_uniport: Optional[str] = None
 
+        is_sep = self._is_sep_line
         for line in lines:
-            if self.SEP_RE.match(line.strip()):
+            stripped = line.strip()
+            if not stripped or is_sep(stripped):
                 continue
 
-            if "|" in line:
-                left, right = line.split("|", 1)
+            left, sep, right = line.partition("|")
+            if sep:
                 left = left.strip()
                 right = right.strip()
 
@@ -387,10 +762,6 @@ class APIOLT2406:
                     self._parse_config_line_into(result["uni"][current_uniport], right)
                     continue
 
-            stripped = line.strip()
-            if not stripped:
-                continue
-
             if current_block == "ont":
                 self._parse_config_line_into(result["ont"], stripped)
             elif current_block == "uni" and current_uniport:
@@ -398,9 +769,17 @@ class APIOLT2406:
 
         return result
 
-    # -----------------------------
-    # Parsing helpers
-    # -----------------------------
+    @staticmethod
+    def _is_sep_line(s: str) -> bool:
+        """
+        Separador de tabla ("-----+-----") en una línea ya "stripped". Equivale, sin regex, a
+        re.match(r"^\s*-+\s*\+\s*-+.*$", s).
+        """
+        if not s.startswith("-"):
+            return False
+        t = s.lstrip("-").lstrip()
+        return t.startswith("+") and t[1:].lstrip().startswith("-")
+
     def _parse_unreg_onts(self, raw: str) -> List[Dict[str, Any]]:
         """
         Parser determinista para el formato real:
@@ -411,38 +790,37 @@ class APIOLT2406:
         Devuelve:
           [{"Pon_AID":"pon-3-3","Type":"UnReg","SN":"...","Password":"DEFAULT","Status":"Active"}, ...]
         """
-        lines = [l.rstrip("\r") for l in raw.splitlines() if l.strip()]
         rows: List[Dict[str, Any]] = []
 
-        for line in lines:
-            s = line.rstrip()
+        is_sep = self._is_sep_line
+        for line in raw.splitlines():
+            s = line.strip()
 
             # cortar al total
-            if s.strip().startswith("Total:"):
+            if s.startswith("Total:"):
                 break
 
-            # saltar separadores (incluyendo los largos de tu ejemplo)
-            if self.SEP_RE.match(s.strip()):
+            # discriminador más barato primero (los separadores no llevan "|")
+            if "|" not in s:
                 continue
 
             # saltar cabecera
-            if s.strip().startswith("Pon_AID"):
+            if s.startswith("Pon_AID"):
                 continue
 
-            if "|" not in s:
+            # saltar separadores (incluyendo los largos de tu ejemplo)
+            if is_sep(s):
                 continue
 
-            left, right = s.split("|", 1)
+            left, _, right = s.partition("|")
             pon_aid = left.strip()
             right = right.strip()
 
             if not pon_aid.startswith("pon-"):
                 continue
 
-            # normalizar espacios del bloque derecho para parseo estable
-            right_norm = " ".join(right.split())
-
-            m = self._UNREG_ROW_RE.match(right_norm)
+            # _UNREG_ROW_RE tolera espacios múltiples: no hace falta normalizar
+            m = self._UNREG_ROW_RE.match(right)
             if not m:
                 rows.append({"Pon_AID": pon_aid, "raw": right})
                 continue
@@ -459,15 +837,24 @@ class APIOLT2406:
 
         return rows
 
-    def _parse_table_any(self, raw: str, row_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
-        lines = [l.rstrip("\r") for l in raw.splitlines() if l.strip()]
+    def _parse_table_lines(self, lines: Iterable[str], row_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Tabla "|" genérica sobre un iterable de líneas (lista o stream de _send_command_stream).
+        """
         headers: Optional[List[str]] = None
         rows: List[Dict[str, Any]] = []
-
+        # Con cabecera ya vista, una fila que no empieza por row_prefix se descarta antes de
+        # partirla: s ya está "stripped", así que cols[0].startswith(p) equivale a
+        # s.startswith(p) (si p no tiene "|" ni whitespace en los extremos).
+        fast_prefix: Optional[str] = None
+        if row_prefix and row_prefix == row_prefix.strip() and "|" not in row_prefix:
+            fast_prefix = row_prefix
+
+        is_sep = self._is_sep_line
         for line in lines:
             s = line.strip()
 
-            if self.SEP_RE.match(s):
+            if is_sep(s):
                 continue
             if "Total:" in s:
                 break
@@ -475,6 +862,9 @@ class APIOLT2406:
             if "|" not in s:
                 continue
 
+            if fast_prefix and headers is not None and not s.startswith(fast_prefix):
+                continue
+
             cols = [c.strip() for c in s.split("|")]
 
             if headers is None:
@@ -498,10 +888,9 @@ class APIOLT2406:
                 else:
                     cols = cols[: len(headers)]
 
-            if row_prefix:
-                first_val = cols[0].strip() if cols else ""
-                if not first_val.startswith(row_prefix):
-                    continue
+            # las columnas ya vienen "stripped"; cols nunca está vacía ("|" in s)
+            if row_prefix and not cols[0].startswith(row_prefix):
+                continue
 
             rows.append(dict(zip(headers, cols)))
 
@@ -523,36 +912,8 @@ class APIOLT2406:
 
         key0 = tokens[0].replace("-", "_").lower()
 
-        if key0 == "queue" and len(tokens) >= 4 and tokens[1] == "tc":
-            entry: Dict[str, Any] = {"tc": int(tokens[2]) if tokens[2].isdigit() else tokens[2]}
-            i = 3
-            while i < len(tokens) - 1:
-                k = tokens[i].replace("-", "_").lower()
-                v = tokens[i + 1]
-                entry[k] = int(v) if v.isdigit() else v
-                i += 2
-            target.setdefault("queues", []).append(entry)
-            return
-
-        if key0 == "bwgroup":
-            target["bwgroup"] = tokens[1] if len(tokens) > 1 else ""
-            i = 2
-            while i < len(tokens) - 1:
-                k = tokens[i].replace("-", "_").lower()
-                v = tokens[i + 1]
-                target[k] = v
-                i += 2
-            return
-
-        if key0 == "vlan":
-            entry: Dict[str, Any] = {"vlan": tokens[1] if len(tokens) > 1 else ""}
-            i = 2
-            while i < len(tokens) - 1:
-                k = tokens[i].replace("-", "_").lower()
-                v = tokens[i + 1]
-                entry[k] = v
-                i += 2
-            target.setdefault("vlans", []).append(entry)
+        handler = self._CONFIG_DISPATCH.get(key0)
+        if handler is not None and handler(self, target, tokens):
             return
 
         if len(tokens) == 2:
@@ -561,11 +922,48 @@ class APIOLT2406:
 
         target.setdefault("lines", []).append(s)
 
+    @staticmethod
+    def _kv_pairs_into(dst: Dict[str, Any], tokens: List[str], start: int, *, cast_int: bool = False) -> None:
+        """
+        Pares "clave valor" desde tokens[start:] (stride 2, un token final suelto se ignora).
+        """
+        pairs = zip(tokens[start::2], tokens[start + 1::2])
+        if cast_int:
+            dst.update({k.replace("-", "_").lower(): (int(v) if v.isdigit() else v) for k, v in pairs})
+        else:
+            dst.update({k.replace("-", "_").lower(): v for k, v in pairs})
+
+    # Handlers por primera palabra de la línea; devuelven False para caer al caso genérico.
+    def _config_queue(self, target: Dict[str, Any], tokens: List[str]) -> bool:
+        if len(tokens) < 4 or tokens[1] != "tc":
+            return False
+        entry: Dict[str, Any] = {"tc": int(tokens[2]) if tokens[2].isdigit() else tokens[2]}
+        self._kv_pairs_into(entry, tokens, 3, cast_int=True)
+        target.setdefault("queues", []).append(entry)
+        return True
+
+    def _config_bwgroup(self, target: Dict[str, Any], tokens: List[str]) -> bool:
+        target["bwgroup"] = tokens[1] if len(tokens) > 1 else ""
+        self._kv_pairs_into(target, tokens, 2)
+        return True
+
+    def _config_vlan(self, target: Dict[str, Any], tokens: List[str]) -> bool:
+        entry: Dict[str, Any] = {"vlan": tokens[1] if len(tokens) > 1 else ""}
+        self._kv_pairs_into(entry, tokens, 2)
+        target.setdefault("vlans", []).append(entry)
+        return True
+
+    _CONFIG_DISPATCH = {
+        "queue": _config_queue,
+        "bwgroup": _config_bwgroup,
+        "vlan": _config_vlan,
+    }
+
     # -----------------------------
     # Utilidades
     # -----------------------------
     def to_json(self, data: Any) -> str:
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _to_json(data, ensure_ascii=False)
 
     def close(self) -> None:
         self._d("close: closing telnet session...")
@@ -577,6 +975,140 @@ class APIOLT2406:
             self.tn.close()
         except Exception:
             pass
+        fp, self._raw_fp = self._raw_fp, None
+        if fp is not None:
+            try:
+                fp.close()
+            except Exception:
+                pass
+
+
+class AsyncAPIOLT2406:
+    """
+    Variante asyncio de APIOLT2406: mismos métodos get_* como corrutinas, para lanzar
+    consultas a muchas OLTs a la vez desde un event loop (asyncio.gather).
+
+    Cada instancia envuelve una sesión APIOLT2406 y la ejecuta en un hilo propio
+    (ThreadPoolExecutor de 1 worker): las llamadas a una misma OLT se serializan (la CLI
+    es secuencial) y las de OLTs distintas avanzan en paralelo sin bloquear el loop.
+    Login, resync de prompt, ANSI y parsers son exactamente los de la versión síncrona.
+
+    La sesión se abre en open() / "async with", o en la primera llamada (aunque varias
+    corrutinas la pidan a la vez solo se hace un login). Tras close() las llamadas lanzan
+    RuntimeError hasta que se vuelva a abrir: open() crea de nuevo sesión e hilo.
+
+        async with AsyncAPIOLT2406(host, port, user, password) as olt:
+            onts = await olt.get_all_onts()
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        # mismos argumentos que APIOLT2406 (host, port, username, password, ...)
+        self._args = args
+        self._kwargs = kwargs
+        self._api: Optional[APIOLT2406] = None
+        # hilo de la sesión: se crea en open() y se cierra en close()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # serializa open()/close(); se crea dentro del loop (en la primera corrutina que lo usa)
+        self._lock: Optional[asyncio.Lock] = None
+        # True tras close(): las llamadas no reabren la sesión por su cuenta
+        self._closed = False
+
+    @staticmethod
+    async def _run(executor: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # dentro de una corrutina devuelve el loop en marcha (get_running_loop no existe en 3.6)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _session(self) -> Tuple[ThreadPoolExecutor, APIOLT2406]:
+        """
+        (hilo, sesión) leídos bajo el lock; abre la sesión si aún no hay.
+        Un close() posterior no los invalida: su api.close() va a la cola del mismo hilo.
+        """
+        async with self._get_lock():
+            if self._closed:
+                raise RuntimeError("AsyncAPIOLT2406 cerrado")
+            return await self._open_locked()
+
+    async def _open_locked(self) -> Tuple[ThreadPoolExecutor, APIOLT2406]:
+        if self._api is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="olt2406")
+            try:
+                api = await self._run(executor, APIOLT2406, *self._args, **self._kwargs)
+            except BaseException:
+                executor.shutdown(wait=False)
+                raise
+            self._executor, self._api = executor, api
+        return self._executor, self._api
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        executor, api = await self._session()
+        return await self._run(executor, getattr(api, method), *args, **kwargs)
+
+    async def open(self) -> "AsyncAPIOLT2406":
+        async with self._get_lock():
+            self._closed = False
+            await self._open_locked()
+        return self
+
+    async def __aenter__(self) -> "AsyncAPIOLT2406":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    # -----------------------------
+    # API pública (corrutinas)
+    # -----------------------------
+    async def get_all_onts(self) -> List[Dict[str, Any]]:
+        return await self._call("get_all_onts")
+
+    async def get_unregistered_onts(self) -> List[Dict[str, Any]]:
+        return await self._call("get_unregistered_onts")
+
+    async def get_ont_details(self, aid: str) -> Dict[str, Any]:
+        return await self._call("get_ont_details", aid)
+
+    async def get_ont_details_bulk(self, aids: List[str], *, batch_size: int = 8) -> Dict[str, Dict[str, Any]]:
+        return await self._call("get_ont_details_bulk", aids, batch_size=batch_size)
+
+    async def get_ont_status_history(self, aid: str) -> List[Dict[str, Any]]:
+        return await self._call("get_ont_status_history", aid)
+
+    async def get_ont_config(self, aid: str, *, bypass_cache: bool = False) -> Dict[str, Any]:
+        return await self._call("get_ont_config", aid, bypass_cache=bypass_cache)
+
+    async def get_ont_full(self, aid: str) -> Dict[str, Any]:
+        return await self._call("get_ont_full", aid)
+
+    async def send_commands(self, commands: List[str]) -> List[str]:
+        return await self._call("send_commands", commands)
+
+    def clear_config_cache(self) -> None:
+        if self._api is not None:
+            self._api.clear_config_cache()
+
+    def to_json(self, data: Any) -> str:
+        # no usa la sesión: no hace falta pasar por el hilo
+        return _to_json(data, ensure_ascii=False)
+
+    async def close(self) -> None:
+        async with self._get_lock():
+            self._closed = True
+            api, self._api = self._api, None
+            executor, self._executor = self._executor, None
+            if executor is None:
+                return
+            try:
+                if api is not None:
+                    await self._run(executor, api.close)
+            finally:
+                # el hilo ya no tiene trabajo pendiente: no hace falta esperar a que termine
+                executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
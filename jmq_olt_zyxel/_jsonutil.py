@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+_jsonutil.py
+
+Serialización JSON común de los clientes OLT (to_json de APIOLT1240XA, APIOLT2406 y APIOLT1408A).
+
+Se usa siempre json estándar: la salida no depende de qué paquetes haya instalados
+(NaN/Infinity, formato de floats, claves no str... se comportan igual en todas partes).
+"""
+
+import json
+from typing import Any
+
+
+def to_json(data: Any, *, ensure_ascii: bool = True) -> str:
+    """
+    Pretty-print JSON con indentación de 2.
+    """
+    return json.dumps(data, indent=2, ensure_ascii=ensure_ascii)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+_rawtelnet.py
+
+Cliente Telnet mínimo sobre socket, compatible con el subconjunto de telnetlib.Telnet
+que usan los clientes OLT1240XA, OLT2406 y OLT1408A
+(open, write, read_until, read_very_eager, get_socket, close).
+
+Motivo:
+- telnetlib procesa la cola raw byte a byte en Python (process_rawq) y lee del socket en
+  bloques pequeños; con salidas grandes (p.ej. "ddmi status" con cientos de ONTs) el coste
+  de CPU domina.
+- Las CLIs Zyxel no negocian opciones reales: basta con rechazar todo (igual que telnetlib
+  por defecto) y copiar los tramos sin IAC en bloque (bytes.find + slice).
+- telnetlib está deprecado y desaparece en Python 3.13.
+"""
+
+import socket
+import select
+import time
+from typing import Dict, Optional
+
+IAC = 255
+DONT = 254
+DO = 253
+WONT = 252
+WILL = 251
+SB = 250
+SE = 240
+
+_IAC_B = bytes([IAC])
+_IAC_SE = bytes([IAC, SE])
+
+# telnetlib descarta NUL y XON de los datos "cooked"; se mantiene el mismo comportamiento
+_DROP_BYTES = b"\x00\x11"
+
+
+class RawTelnet:
+    """
+    Socket + bytearray con procesado de IAC por tramos.
+    """
+
+    # recv grande: las salidas de tabla llegan en ráfagas de decenas de KB
+    RECV_SIZE = 65536
+    # buffer de recepción del kernel: una tabla grande cabe en pocos recv()
+    SO_RCVBUF_SIZE = 262144
+
+    def __init__(self):
+        self.sock: Optional[socket.socket] = None
+        self.eof = False
+        self._rawq = bytearray()
+        self._cooked = bytearray()
+        self._in_sb = False
+
+    # -----------------------------
+    # Conexión
+    # -----------------------------
+    def open(self, host: str, port: int = 23, timeout: Optional[float] = None) -> None:
+        self.eof = False
+        self._rawq.clear()
+        self._cooked.clear()
+        self._in_sb = False
+        self.sock = socket.create_connection((host, port), timeout)
+        self._tune_socket()
+
+    def _tune_socket(self) -> None:
+        """
+        TCP_NODELAY: los comandos son escrituras pequeñas seguidas de espera de respuesta;
+        sin él Nagle + delayed ACK pueden añadir ~40 ms por comando.
+        SO_RCVBUF: ventana mayor para volcados largos.
+        SO_KEEPALIVE: detecta sesiones muertas que quedan abiertas mucho tiempo (p.ej. en un pool).
+        Best-effort (el SO puede ignorarlo o limitarlo).
+        """
+        try:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        except OSError:
+            pass
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SO_RCVBUF_SIZE)
+        except OSError:
+            pass
+
+    def socket_options(self) -> Dict[str, int]:
+        """
+        Valores efectivos (getsockopt) de las opciones de _tune_socket, para trazas de debug.
+        -1 si no se pueden leer. Ojo: en Linux SO_RCVBUF devuelve el doble de lo pedido.
+        """
+        opts = {
+            "TCP_NODELAY": (socket.IPPROTO_TCP, socket.TCP_NODELAY),
+            "SO_KEEPALIVE": (socket.SOL_SOCKET, socket.SO_KEEPALIVE),
+            "SO_RCVBUF": (socket.SOL_SOCKET, socket.SO_RCVBUF),
+        }
+        values: Dict[str, int] = {}
+        for name, (level, opt) in opts.items():
+            try:
+                values[name] = self.sock.getsockopt(level, opt)
+            except (OSError, AttributeError):
+                values[name] = -1
+        return values
+
+    def get_socket(self) -> Optional[socket.socket]:
+        return self.sock
+
+    def close(self) -> None:
+        sock = self.sock
+        self.sock = None
+        self.eof = True
+        if sock is not None:
+            sock.close()
+
+    # -----------------------------
+    # Escritura
+    # -----------------------------
+    def write(self, data: bytes) -> None:
+        if _IAC_B in data:
+            data = data.replace(_IAC_B, _IAC_B + _IAC_B)
+        self.sock.sendall(data)
+
+    # -----------------------------
+    # Lectura
+    # -----------------------------
+    def _sock_avail(self) -> bool:
+        return bool(select.select([self.sock], [], [], 0)[0])
+
+    def _fill_rawq(self) -> None:
+        """
+        Un recv() en bloque; marca eof si el peer cierra.
+        """
+        data = self.sock.recv(self.RECV_SIZE)
+        if not data:
+            self.eof = True
+            return
+        self._rawq += data
+
+    def _process_rawq(self) -> None:
+        """
+        Pasa de rawq a cooked copiando en bloque los tramos sin IAC.
+        Un comando IAC incompleto al final se deja en rawq hasta el siguiente recv.
+        """
+        raw = self._rawq
+        cooked = self._cooked
+        n = len(raw)
+        i = 0
+
+        while i < n:
+            if self._in_sb:
+                j = raw.find(_IAC_SE, i)
+                if j < 0:
+                    # conservar un IAC final por si el SE llega en el siguiente recv
+                    i = n - 1 if raw[n - 1] == IAC else n
+                    break
+                self._in_sb = False
+                i = j + 2
+                continue
+
+            j = raw.find(_IAC_B, i)
+            if j < 0:
+                cooked += raw[i:].translate(None, _DROP_BYTES)
+                i = n
+                break
+
+            if j > i:
+                cooked += raw[i:j].translate(None, _DROP_BYTES)
+
+            if j + 1 >= n:
+                i = j
+                break
+
+            cmd = raw[j + 1]
+            if cmd == IAC:
+                cooked.append(IAC)
+                i = j + 2
+            elif cmd in (DO, DONT, WILL, WONT):
+                if j + 2 >= n:
+                    i = j
+                    break
+                opt = raw[j + 2]
+                # Rechazar cualquier opción (comportamiento por defecto de telnetlib)
+                if cmd in (DO, DONT):
+                    self.sock.sendall(bytes([IAC, WONT, opt]))
+                else:
+                    self.sock.sendall(bytes([IAC, DONT, opt]))
+                i = j + 3
+            elif cmd == SB:
+                self._in_sb = True
+                i = j + 2
+            else:
+                # NOP, GA, etc.: se ignoran
+                i = j + 2
+
+        del raw[:i]
+
+    def _take_cooked(self, upto: Optional[int] = None) -> bytes:
+        if upto is None:
+            out = bytes(self._cooked)
+            self._cooked.clear()
+        else:
+            out = bytes(self._cooked[:upto])
+            del self._cooked[:upto]
+        return out
+
+    def read_very_eager(self) -> bytes:
+        """
+        Todo lo disponible sin bloquear. EOFError si la conexión está cerrada y no queda nada.
+        """
+        while not self.eof and self._sock_avail():
+            self._fill_rawq()
+        self._process_rawq()
+        if not self._cooked and self.eof:
+            raise EOFError("telnet connection closed")
+        return self._take_cooked()
+
+    def read_until(self, match: bytes, timeout: Optional[float] = None) -> bytes:
+        """
+        Lee hasta `match` (incluido) o hasta timeout/eof, devolviendo lo acumulado.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        search_from = 0
+
+        while True:
+            k = self._cooked.find(match, search_from)
+            if k >= 0:
+                return self._take_cooked(k + len(match))
+            search_from = max(0, len(self._cooked) - len(match) + 1)
+
+            if self.eof:
+                break
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            if not select.select([self.sock], [], [], remaining)[0]:
+                break
+
+            self._fill_rawq()
+            self._process_rawq()
+
+        out = self._take_cooked()
+        if not out and self.eof:
+            raise EOFError("telnet connection closed")
+        return out
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+tests/_mockolt.py
+
+Servidor Telnet de pruebas (local, sin OLT real) para los tests unitarios.
+Imita lo que hacen las CLIs Zyxel:
+  - negociación IAC al conectar (DO/WILL/SB) y consulta ANSI ESC[6n antes del login
+  - login usuario/password
+  - eco del comando + salida + prompt, con los 0xFF de datos duplicados (IAC IAC)
+
+Las respuestas se configuran por comando ({comando: salida}); un comando desconocido
+devuelve salida vacía. Todo lo recibido queda en MockOLT.log (una entrada por línea).
+"""
+
+import socket
+import threading
+from typing import Dict, List, Optional, Set
+
+IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+
+NEGOTIATION = bytes([IAC, DO, 1, IAC, WILL, 3, IAC, SB, 24, 1, IAC, SE])
+
+
+class MockOLT:
+    """
+    Servidor en 127.0.0.1 (puerto libre) con un hilo por conexión.
+    no_echo_once: comandos que la primera vez se responden sin eco (salida desalineada).
+    """
+
+    def __init__(
+        self,
+        prompt: str,
+        responses: Dict[str, str],
+        *,
+        login_prompt: bytes = b"User name:",
+        no_echo_once: Optional[Set[str]] = None,
+    ):
+        self.prompt = prompt.encode("ascii")
+        self.responses = responses
+        self.login_prompt = login_prompt
+        self.no_echo_once = set(no_echo_once or ())
+        self.log: List[bytes] = []
+        self.logins = 0
+        self._lock = threading.Lock()
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(8)
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def count(self, command: str) -> int:
+        with self._lock:
+            return self.log.count(command.encode("ascii"))
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._session, args=(conn,), daemon=True).start()
+
+    @staticmethod
+    def _readline(conn: socket.socket) -> Optional[bytes]:
+        line = b""
+        while not line.endswith(b"\n"):
+            c = conn.recv(1)
+            if not c:
+                return None
+            line += c
+        return line
+
+    @staticmethod
+    def _clean(line: bytes) -> bytes:
+        # fuera el IAC IAC del cliente, las respuestas a la negociación y la respuesta ANSI
+        cmd = line.replace(bytes([IAC, IAC]), bytes([IAC])).strip(b"\r\n")
+        while cmd.startswith(bytes([IAC])):
+            cmd = cmd[3:]
+        return cmd.replace(b"\x1b[1;1R", b"")
+
+    def _session(self, conn: socket.socket) -> None:
+        with conn:
+            conn.sendall(NEGOTIATION + b"\x1b[6n" + self.login_prompt)
+            if self._readline(conn) is None:
+                return
+            conn.sendall(b"Password:")
+            if self._readline(conn) is None:
+                return
+            with self._lock:
+                self.logins += 1
+            conn.sendall(b"\r\nWelcome\r\n" + self.prompt)
+            while True:
+                line = self._readline(conn)
+                if line is None or line.strip() == b"exit":
+                    return
+                cmd = self._clean(line)
+                text = cmd.decode("latin-1")
+                with self._lock:
+                    self.log.append(cmd)
+                    echo = text not in self.no_echo_once
+                    self.no_echo_once.discard(text)
+                resp = self.responses.get(text, "").replace("\n", "\r\n")
+                body = text + "\r\n" + resp if (cmd and echo) else resp
+                out = body.encode("latin-1") + b"\r\n" + self.prompt
+                conn.sendall(out.replace(b"\xff", b"\xff\xff"))
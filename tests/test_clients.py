@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+tests/test_clients.py
+
+Tests unitarios de los clientes contra el servidor Telnet local de _mockolt (sin OLT real):
+  - send_commands: pipelining y vuelta a comando a comando si la salida no cuadra
+  - cachés con TTL: DDMI (OLT1240XA) y config (OLT2406)
+  - sesiones DDMI paralelas de OLT1240XA: config de debug de los workers
+  - ESC[6n partido entre dos chunks (_ansi_autoreply)
+  - ConnectionPool de OLT1408A: reutilización, caducidad y credenciales
+  - AsyncAPIOLT2406: un solo login y llamadas concurrentes con close()
+Ejecuta:
+  python -m unittest discover -s tests
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from _mockolt import MockOLT
+from jmq_olt_zyxel.OLT1240XA import APIOLT1240XA
+from jmq_olt_zyxel.OLT1408A import APIOLT1408A, ConnectionPool
+from jmq_olt_zyxel.OLT2406 import APIOLT2406, AsyncAPIOLT2406
+
+CONFIG_2406 = """\
+  AID | Details
+  ----+------
+  ont-3-1-1   | sn 5A5958458CAEF052
+              | bwgroup 1 usbwprofname 50Megas dsbwprofname x
+              | vlan 107 priority 0
+  uniport-3-1-1-2-1 | queue tc 0 priority 0 weight 0
+              | vlan 41 gemport 373
+"""
+
+DDMI_1240 = """\
+  ONT ID          Alarm   Rx Power(dBm)
+  --------------  -----   -------------
+ont-1-1-1              -25.27
+ont-1-1-10       -      -32.80
+"""
+
+CMD_CONFIG = "show remote ont ont-3-1-1 config"
+CMD_DDMI = "show interface gpon 1-* ddmi status"
+CMD_DDMI_5 = "show interface gpon 5-* ddmi status"
+
+
+class _MockTestCase(unittest.TestCase):
+    PROMPT = ""
+    LOGIN = b"User name:"
+    RESPONSES = {}
+
+    def start(self, **kw):
+        server = MockOLT(self.PROMPT, self.RESPONSES, login_prompt=self.LOGIN, **kw)
+        self.addCleanup(server.close)
+        return server
+
+    def connect(self, cls, server, **kw):
+        api = cls("127.0.0.1", server.port, "admin", "pw", prompt=self.PROMPT, timeout=5, **kw)
+        self.addCleanup(api.close)
+        return api
+
+
+class SendCommandsTest(_MockTestCase):
+    RESPONSES = {"cmd a": "out a", "cmd b": "out b\nline 2", "cmd c": ""}
+    COMMANDS = ["cmd a", "cmd b", "cmd c"]
+    EXPECTED = ["out a", "out b\nline 2", ""]
+
+    def _check(self, cls, prompt, login):
+        self.PROMPT, self.LOGIN = prompt, login
+
+        server = self.start()
+        api = self.connect(cls, server)
+        self.assertEqual(api.send_commands(self.COMMANDS), self.EXPECTED)
+        # pipelining: cada comando se envía una sola vez
+        self.assertEqual([server.count(c) for c in self.COMMANDS], [1, 1, 1])
+
+        # una respuesta sin eco: se repite todo comando a comando
+        server = self.start(no_echo_once={"cmd b"})
+        api = self.connect(cls, server)
+        self.assertEqual(api.send_commands(self.COMMANDS), self.EXPECTED)
+        self.assertEqual([server.count(c) for c in self.COMMANDS], [2, 2, 2])
+        # la sesión sigue alineada después de la vuelta atrás
+        self.assertEqual(api.send_commands(["cmd a", "cmd c"]), ["out a", ""])
+
+    def test_olt2406(self):
+        self._check(APIOLT2406, "OLT2406#", b"User name:")
+
+    def test_olt1240xa(self):
+        self._check(APIOLT1240XA, "MSC1240XA#", b"MSC1240XA login:")
+
+
+class ConfigCacheTest(_MockTestCase):
+    PROMPT = "OLT2406#"
+    RESPONSES = {CMD_CONFIG: CONFIG_2406}
+
+    def test_disabled_by_default(self):
+        server = self.start()
+        api = self.connect(APIOLT2406, server)
+        self.assertEqual(api.get_ont_config("ont-3-1-1"), api.get_ont_config("ont-3-1-1"))
+        self.assertEqual(server.count(CMD_CONFIG), 2)
+
+    def test_hit_copy_bypass_and_clear(self):
+        server = self.start()
+        api = self.connect(APIOLT2406, server, config_cache_ttl=60)
+        first = api.get_ont_config("ont-3-1-1")
+        self.assertEqual(first["ont"]["sn"], "5A5958458CAEF052")
+        first["ont"]["sn"] = "changed"
+        # se devuelve una copia: mutar el resultado no toca la caché
+        self.assertEqual(api.get_ont_config("ont-3-1-1")["ont"]["sn"], "5A5958458CAEF052")
+        self.assertEqual(server.count(CMD_CONFIG), 1)
+
+        api.get_ont_config("ont-3-1-1", bypass_cache=True)
+        self.assertEqual(server.count(CMD_CONFIG), 2)
+
+        api.clear_config_cache()
+        api.get_ont_config("ont-3-1-1")
+        self.assertEqual(server.count(CMD_CONFIG), 3)
+
+    def test_expiry(self):
+        server = self.start()
+        api = self.connect(APIOLT2406, server, config_cache_ttl=0.2)
+        api.get_ont_config("ont-3-1-1")
+        api.get_ont_config("ont-3-1-1")
+        self.assertEqual(server.count(CMD_CONFIG), 1)
+        time.sleep(0.3)
+        api.get_ont_config("ont-3-1-1")
+        self.assertEqual(server.count(CMD_CONFIG), 2)
+
+    def test_empty_config_not_cached(self):
+        server = self.start()
+        api = self.connect(APIOLT2406, server, config_cache_ttl=60)
+        api.get_ont_config("ont-9-9-9")
+        api.get_ont_config("ont-9-9-9")
+        self.assertEqual(server.count("show remote ont ont-9-9-9 config"), 2)
+
+
+class DdmiCacheTest(_MockTestCase):
+    PROMPT = "MSC1240XA#"
+    LOGIN = b"MSC1240XA login:"
+    RESPONSES = {CMD_DDMI: DDMI_1240}
+
+    def test_hit_bypass_and_clear(self):
+        server = self.start()
+        api = self.connect(APIOLT1240XA, server, ddmi_cache_ttl=60)
+        expected = {"1-1-1": "-25.27", "1-1-10": "-32.80"}
+        self.assertEqual(api._get_ddmi_rx_map_for_slot(1), expected)
+        self.assertEqual(api._get_ddmi_rx_map_for_slot(1), expected)
+        self.assertEqual(server.count(CMD_DDMI), 1)
+
+        api._get_ddmi_rx_map_for_slot(1, bypass_cache=True)
+        self.assertEqual(server.count(CMD_DDMI), 2)
+
+        api.clear_ddmi_cache()
+        api._get_ddmi_rx_map_for_slot(1)
+        self.assertEqual(server.count(CMD_DDMI), 3)
+
+    def test_expiry(self):
+        server = self.start()
+        api = self.connect(APIOLT1240XA, server, ddmi_cache_ttl=0.2)
+        api._get_ddmi_rx_map_for_slot(1)
+        api._get_ddmi_rx_map_for_slot(1)
+        self.assertEqual(server.count(CMD_DDMI), 1)
+        time.sleep(0.3)
+        api._get_ddmi_rx_map_for_slot(1)
+        self.assertEqual(server.count(CMD_DDMI), 2)
+
+    def test_ttl_zero_disables_cache(self):
+        server = self.start()
+        api = self.connect(APIOLT1240XA, server, ddmi_cache_ttl=0)
+        api._get_ddmi_rx_map_for_slot(1)
+        api._get_ddmi_rx_map_for_slot(1)
+        self.assertEqual(server.count(CMD_DDMI), 2)
+
+
+class DdmiParallelDebugTest(_MockTestCase):
+    PROMPT = "MSC1240XA#"
+    LOGIN = b"MSC1240XA login:"
+    RESPONSES = {CMD_DDMI: DDMI_1240, CMD_DDMI_5: "ont-5-2-3   -20\n"}
+
+    def _fetch(self, **kw):
+        server = self.start()
+        # debug=True imprime trazas _d(): se recogen para no ensuciar la salida del test
+        with contextlib.redirect_stdout(io.StringIO()):
+            api = APIOLT1240XA("127.0.0.1", server.port, "admin", "pw", prompt=self.PROMPT, timeout=5,
+                               debug=True, ddmi_cache_ttl=0, **kw)
+            try:
+                rx = api._get_ddmi_rx_map_for_slots([1, 5])
+            finally:
+                api.close()
+        self.assertEqual(rx, {"1-1-1": "-25.27", "1-1-10": "-32.80", "5-2-3": "-20"})
+        # los dos slots fueron por sesiones adicionales
+        self.assertEqual(server.logins, 3)
+        return server
+
+    def _worker_kwargs(self, **kw):
+        seen = []
+        real_init = APIOLT1240XA.__init__
+
+        def spy(api, *args, **kwargs):
+            seen.append(kwargs)
+            real_init(api, *args, **kwargs)
+
+        APIOLT1240XA.__init__ = spy
+        try:
+            self._fetch(**kw)
+        finally:
+            APIOLT1240XA.__init__ = real_init
+        # seen[0] es la sesión principal
+        return seen[1:]
+
+    def test_workers_inherit_disabled_raw_file(self):
+        workers = self._worker_kwargs(debug_telnet_raw_file=None, debug_telnet_dump=False)
+        self.assertEqual(len(workers), 2)
+        for kwargs in workers:
+            self.assertIsNone(kwargs["debug_telnet_raw_file"])
+            self.assertFalse(kwargs["debug_telnet_dump"])
+
+    def test_workers_write_one_raw_file_per_slot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "raw.log")
+            self._fetch(debug_telnet_raw_file=path)
+            self.assertEqual(sorted(os.listdir(tmp)), ["raw.log", "raw.log.slot1", "raw.log.slot5"])
+            with open(path + ".slot1", "rb") as fp:
+                slot1 = fp.read()
+            with open(path + ".slot5", "rb") as fp:
+                slot5 = fp.read()
+            with open(path, "rb") as fp:
+                main = fp.read()
+        self.assertIn(b"-25.27", slot1)
+        self.assertNotIn(b"ont-5-2-3", slot1)
+        self.assertIn(b"ont-5-2-3", slot5)
+        self.assertNotIn(b"ddmi status", main)
+
+
+class _FakeTelnet:
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+
+class AnsiAutoreplyTest(unittest.TestCase):
+    def _api(self, cls):
+        # solo se necesita el estado que usa _ansi_autoreply (sin sesión Telnet)
+        api = object.__new__(cls)
+        api.tn = _FakeTelnet()
+        api._ansi_carry = b""
+        api._d = lambda msg: None
+        return api
+
+    def test_split_query_is_answered_once(self):
+        for cls in (APIOLT2406, APIOLT1240XA):
+            for cut in (1, 2, 3):
+                with self.subTest(cls=cls.__name__, cut=cut):
+                    api = self._api(cls)
+                    query = b"\x1b[6n"
+                    api._ansi_autoreply(b"banner" + query[:cut])
+                    self.assertEqual(api.tn.written, [])
+                    api._ansi_autoreply(query[cut:] + b"login:")
+                    self.assertEqual(api.tn.written, [b"\x1b[1;1R"])
+                    self.assertEqual(api._ansi_carry, b"")
+
+    def test_whole_query_and_plain_data(self):
+        for cls in (APIOLT2406, APIOLT1240XA):
+            with self.subTest(cls=cls.__name__):
+                api = self._api(cls)
+                api._ansi_autoreply(b"plain output\r\n")
+                api._ansi_autoreply(b"\x1b[2J")
+                self.assertEqual(api.tn.written, [])
+                api._ansi_autoreply(b"x\x1b[6ny")
+                self.assertEqual(api.tn.written, [b"\x1b[1;1R"])
+
+
+class ConnectionPoolTest(_MockTestCase):
+    PROMPT = "OLT1408A#"
+    RESPONSES = {
+        "show remote ont ont-1-%d" % i: "  | SN : 5A59%04d\n  | Status : IS\n" % i for i in range(6)
+    }
+
+    def _pool(self, **kw):
+        pool = ConnectionPool(**kw)
+        self.addCleanup(pool.close_all)
+        return pool
+
+    def _acquire(self, pool, server, password="pw"):
+        api = pool.acquire("127.0.0.1", server.port, "admin", password, prompt=self.PROMPT)
+        # las que el test no devuelve al pool (close() es idempotente)
+        self.addCleanup(api.close)
+        return api
+
+    def test_reuse(self):
+        server = self.start()
+        pool = self._pool()
+        api = self._acquire(pool, server)
+        pool.release(api)
+        self.assertIs(self._acquire(pool, server), api)
+        self.assertEqual((pool.hits, pool.misses, server.logins), (1, 1, 1))
+
+    def test_idle_timeout(self):
+        server = self.start()
+        pool = self._pool(idle_timeout=0.1)
+        api = self._acquire(pool, server)
+        pool.release(api)
+        time.sleep(0.2)
+        self.assertIsNot(self._acquire(pool, server), api)
+        self.assertEqual((pool.hits, pool.misses, server.logins), (0, 2, 2))
+        self.assertIsNone(api.tn.get_socket())
+
+    def test_max_age(self):
+        server = self.start()
+        pool = self._pool(max_age=0.1)
+        api = self._acquire(pool, server)
+        time.sleep(0.2)
+        # demasiado vieja al devolverla: se cierra en lugar de volver al pool
+        pool.release(api)
+        self.assertIsNone(api.tn.get_socket())
+        self.assertIsNot(self._acquire(pool, server), api)
+        self.assertEqual((pool.hits, pool.misses), (0, 2))
+
+    def test_password_is_part_of_key(self):
+        server = self.start()
+        pool = self._pool()
+        pool.release(self._acquire(pool, server))
+        self._acquire(pool, server, password="other")
+        self.assertEqual((pool.hits, pool.misses), (0, 2))
+
+    def test_max_idle_and_discard(self):
+        server = self.start()
+        pool = self._pool(max_idle=1)
+        a, b = self._acquire(pool, server), self._acquire(pool, server)
+        pool.release(a)
+        pool.release(b)
+        self.assertIsNone(b.tn.get_socket())
+        c = self._acquire(pool, server)
+        self.assertIs(c, a)
+        pool.discard(c)
+        self.assertIsNot(self._acquire(pool, server), c)
+        self.assertEqual((pool.hits, pool.misses), (1, 3))
+
+    def test_get_details_bulk(self):
+        server = self.start()
+        pool = self._pool()
+        aids = ["ont-1-%d" % i for i in range(6)]
+        for _ in range(2):
+            res = APIOLT1408A.get_details_bulk(
+                "127.0.0.1", server.port, "admin", "pw", aids, concurrency=2, pool=pool
+            )
+            self.assertEqual([res[a]["SN"] for a in aids], ["5A59%04d" % i for i in range(6)])
+        # segunda pasada sin logins nuevos
+        self.assertEqual(server.logins, pool.misses)
+        self.assertLessEqual(pool.misses, 2)
+
+
+class AsyncAPIOLT2406Test(_MockTestCase):
+    PROMPT = "OLT2406#"
+    RESPONSES = {"cmd a": "out a"}
+
+    def _run(self, coro):
+        # sin asyncio.run (3.7+)
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def _olt(self, server):
+        return AsyncAPIOLT2406("127.0.0.1", server.port, "admin", "pw", prompt=self.PROMPT, timeout=5)
+
+    def test_concurrent_calls_single_login(self):
+        server = self.start()
+
+        async def main():
+            olt = self._olt(server)
+            try:
+                return await asyncio.gather(*(olt.send_commands(["cmd a"]) for _ in range(4)))
+            finally:
+                await olt.close()
+
+        self.assertEqual(self._run(main()), [["out a"]] * 4)
+        self.assertEqual(server.logins, 1)
+
+    def _call_and_close(self, server, opened):
+        async def main():
+            olt = self._olt(server)
+            if opened:
+                await olt.open()
+            calls = [olt.send_commands(["cmd a"]) for _ in range(3)]
+            res = await asyncio.gather(calls[0], olt.close(), *calls[1:], return_exceptions=True)
+            self.assertIsNone(olt._api)
+            return res
+
+        res = self._run(main())
+        # la llamada que obtuvo la sesión antes de close() termina bien; las demás ven la instancia cerrada
+        self.assertEqual(res[0], ["out a"])
+        self.assertIsNone(res[1])
+        for r in res[2:]:
+            self.assertIsInstance(r, RuntimeError)
+            self.assertEqual(str(r), "AsyncAPIOLT2406 cerrado")
+
+    def test_call_and_close_while_opening(self):
+        server = self.start()
+        self._call_and_close(server, opened=False)
+        self.assertEqual(server.logins, 1)
+
+    def test_call_and_close_when_open(self):
+        server = self.start()
+        self._call_and_close(server, opened=True)
+        self.assertEqual(server.logins, 1)
+
+    def test_reopen_after_close(self):
+        server = self.start()
+
+        async def main():
+            olt = self._olt(server)
+            first = await olt.send_commands(["cmd a"])
+            await olt.close()
+            with self.assertRaises(RuntimeError):
+                await olt.send_commands(["cmd a"])
+            async with olt:
+                second = await olt.send_commands(["cmd a"])
+            await olt.close()
+            return first, second
+
+        self.assertEqual(self._run(main()), (["out a"], ["out a"]))
+        self.assertEqual(server.logins, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+tests/test_rawtelnet.py
+
+Tests unitarios de RawTelnet sobre un socketpair (sin red ni OLT).
+Ejecuta:
+  python -m unittest discover -s tests
+"""
+
+import select
+import socket
+import threading
+import unittest
+
+from jmq_olt_zyxel._rawtelnet import DO, DONT, IAC, SB, SE, WILL, WONT, RawTelnet
+
+
+class RawTelnetTest(unittest.TestCase):
+    def setUp(self):
+        self.tn = RawTelnet()
+        self.tn.sock, self.peer = socket.socketpair()
+        self.peer.settimeout(1)
+
+    def tearDown(self):
+        self.tn.close()
+        self.peer.close()
+
+    def _feed(self, data: bytes) -> bytes:
+        # un envío = un recv() en el cliente: se espera a que llegue antes de leer
+        self.peer.sendall(data)
+        select.select([self.tn.sock], [], [], 1)
+        return self.tn.read_very_eager()
+
+    def _peer_recv(self, n: int) -> bytes:
+        out = b""
+        while len(out) < n:
+            out += self.peer.recv(n - len(out))
+        return out
+
+    def test_write_doubles_iac(self):
+        self.tn.write(b"a\xffb\xff")
+        self.assertEqual(self._peer_recv(6), b"a\xff\xffb\xff\xff")
+
+    def test_write_without_iac_is_unchanged(self):
+        self.tn.write(b"show remote ont\r\n")
+        self.assertEqual(self._peer_recv(17), b"show remote ont\r\n")
+
+    def test_refuses_all_options(self):
+        out = self._feed(bytes([IAC, DO, 1, IAC, WILL, 3, IAC, DONT, 5, IAC, WONT, 6]) + b"hi")
+        self.assertEqual(out, b"hi")
+        self.assertEqual(
+            self._peer_recv(12),
+            bytes([IAC, WONT, 1, IAC, DONT, 3, IAC, WONT, 5, IAC, DONT, 6]),
+        )
+
+    def test_escaped_iac_is_data(self):
+        self.assertEqual(self._feed(b"x\xff\xffy"), b"x\xffy")
+
+    def test_drops_nul_and_xon(self):
+        self.assertEqual(self._feed(b"a\x00b\x11c"), b"abc")
+
+    def test_iac_iac_split_across_recv(self):
+        self.assertEqual(self._feed(b"ab\xff"), b"ab")
+        self.assertEqual(self._feed(b"\xffcd"), b"\xffcd")
+
+    def test_option_split_across_recv(self):
+        self.assertEqual(self._feed(bytes([ord("x"), IAC, DO])), b"x")
+        self.assertEqual(self._feed(bytes([1]) + b"y"), b"y")
+        self.assertEqual(self._peer_recv(3), bytes([IAC, WONT, 1]))
+
+    def test_subnegotiation_split_across_recv(self):
+        self.assertEqual(self._feed(bytes([IAC, SB, 24, 1, IAC])), b"")
+        self.assertEqual(self._feed(bytes([SE]) + b"z"), b"z")
+
+    def test_read_until_includes_match(self):
+        self.peer.sendall(b"out\r\nOLT2406#rest")
+        self.assertEqual(self.tn.read_until(b"OLT2406#", timeout=1), b"out\r\nOLT2406#")
+        self.assertEqual(self.tn.read_until(b"rest", timeout=1), b"rest")
+
+    def test_read_until_match_split_across_recv(self):
+        self.peer.sendall(b"out\r\nOLT24")
+        later = threading.Timer(0.05, self.peer.sendall, args=(b"06#",))
+        later.start()
+        try:
+            self.assertEqual(self.tn.read_until(b"OLT2406#", timeout=1), b"out\r\nOLT2406#")
+        finally:
+            later.join()
+
+    def test_read_until_timeout_returns_partial(self):
+        self.peer.sendall(b"partial")
+        self.assertEqual(self.tn.read_until(b"#", timeout=0.05), b"partial")
+
+    def test_eof(self):
+        self.peer.sendall(b"bye")
+        self.peer.close()
+        self.assertEqual(self.tn.read_until(b"#", timeout=1), b"bye")
+        with self.assertRaises(EOFError):
+            self.tn.read_very_eager()
+
+
+if __name__ == "__main__":
+    unittest.main()